@@ -1,13 +1,26 @@
 import os
 import json
 import platform
+from collections import deque
+from itertools import chain, islice, repeat
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from rate_limiter import rate_limit
+from excel_colunar import eh_colunar, escrever_planilha, linhas_colunares, preparar_colunas
+from fontes_dados import eh_fonte_tabular, iter_fonte, converter_para_xlsx
+from leitor_xlsx import LeitorXlsx, iter_planilha, ler_xlsx
+from tabela_colunar import TabelaColunar
+from planilhas import ler_planilhas, escrever_planilhas, amostras_planilhas
+from tabela_word import inserir_tabela
+from mala_direta import gerar_documentos
+from resumo_word import CacheResumos, dividir_em_blocos, resumir_blocos, resumo_valido
+from relatorio_incremental import analisar_incremental
+from lote_ia import AgrupadorPerguntas, perguntar_em_lote
+from profiler import ativar_profiling, profiling_ativado, ENV_PASTA
 import google.generativeai as genai
 
 
@@ -16,13 +29,16 @@ class AgenteOfficeIA:
     Agente automático que integra Excel, Word e IA (Gemini)
     """
 
-    def __init__(self, api_key=None, modelo="gemini-2.0-flash"):
+    def __init__(self, api_key=None, modelo="gemini-2.0-flash", profiling=None, pasta_profiling=None):
         """
         Inicializa o agente com a chave da API do Google Gemini
 
         Args:
             api_key: Chave da API do Google
             modelo: Nome do modelo Gemini (padrão: gemini-2.0-flash-exp)
+            profiling: grava perfil de CPU/memória a cada método público
+                       (padrão: variável de ambiente AGENTE_PROFILING)
+            pasta_profiling: pasta dos perfis (padrão: AGENTE_PROFILING_DIR ou "profiling")
         """
         self.api_key = api_key or os.environ.get("GOOGLE_API_KEY")
         self.modelo = modelo
@@ -35,6 +51,13 @@ class AgenteOfficeIA:
             self.model = None
             print("⚠️  API Key não fornecida. Funções de IA estarão desabilitadas.")
 
+        if profiling is None:
+            profiling = profiling_ativado()
+        if profiling:
+            pasta = pasta_profiling or os.environ.get(ENV_PASTA) or "profiling"
+            ativar_profiling(self, pasta)
+            print(f"🔬 Profiling ativado: {pasta}")
+
     # ============ FUNÇÕES EXCEL ============
 
     def criar_excel(self, arquivo, dados, cabecalhos=None):
@@ -43,76 +66,158 @@ class AgenteOfficeIA:
 
         Args:
             arquivo: nome do arquivo .xlsx
-            dados: lista de listas com os dados
-            cabecalhos: lista com nomes das colunas
-        """
-        wb = openpyxl.Workbook()
-        ws = wb.active
-
-        # Adiciona cabeçalhos se fornecidos
-        if cabecalhos:
-            ws.append(cabecalhos)
-            # Formata cabeçalhos
-            for cell in ws[1]:
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
-
-        # Adiciona dados
-        for linha in dados:
-            ws.append(linha)
-
-        # Ajusta largura das colunas
-        for column in ws.columns:
-            max_length = 0
-            column = [cell for cell in column]
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(cell.value)
-                except:
-                    pass
-            adjusted_width = (max_length + 2)
-            ws.column_dimensions[column[0].column_letter].width = adjusted_width
-
+            dados: lista de listas (ou iterável de linhas, ex.: iter_excel), TabelaColunar de ler_excel,
+                   array NumPy, DataFrame pandas ou Table Arrow
+            cabecalhos: lista com nomes das colunas (padrão para DataFrame/Arrow: nomes das colunas)
+        """
+        wb = openpyxl.Workbook(write_only=True)
+        escrever_planilha(wb.create_sheet(), dados, cabecalhos)
         wb.save(arquivo)
         print(f"✅ Excel criado: {arquivo}")
         return arquivo
 
-    def ler_excel(self, arquivo, sheet=None):
+    def ler_excel(self, arquivo, sheet=None, engine="openpyxl", compacto=False):
         """
         Lê dados de um arquivo Excel
 
         Args:
-            arquivo: nome do arquivo .xlsx
+            arquivo: nome do arquivo .xlsx (ou .csv/.parquet, lidos direto)
             sheet: nome da planilha (opcional)
+            engine: "openpyxl" (padrão) ou "fast", que lê o XML da planilha
+                    direto do arquivo, sem criar objetos Cell (bem mais rápido
+                    em arquivos grandes, mesmo resultado)
+            compacto: retorna uma TabelaColunar, com as colunas em buffers
+                      compactos (bem menos memória em planilhas grandes), que
+                      se comporta como a lista de listas. O .xlsx é lido em
+                      streaming pelo leitor fast, com qualquer engine
 
         Returns:
-            Lista de listas com os dados
+            Lista de listas com os dados (ou TabelaColunar)
         """
-        wb = openpyxl.load_workbook(arquivo)
-        ws = wb[sheet] if sheet else wb.active
+        if eh_fonte_tabular(arquivo):
+            linhas = iter_fonte(arquivo)
+        elif engine not in ("openpyxl", "fast"):
+            raise ValueError(f"Engine desconhecida: {engine} (use 'openpyxl' ou 'fast')")
+        elif engine == "fast" or compacto:
+            # compacto: as linhas vêm em streaming do leitor fast, sem criar um
+            # objeto Cell por célula (o modo read_only do openpyxl não converte
+            # durações e daria um resultado diferente do ler_excel normal)
+            linhas = None
+            dados = ler_xlsx(arquivo, sheet, compacto)
+        else:
+            wb = openpyxl.load_workbook(arquivo)
+            ws = wb[sheet] if sheet else wb.active
+            linhas = (list(row) for row in ws.iter_rows(values_only=True))
 
-        dados = []
-        for row in ws.iter_rows(values_only=True):
-            dados.append(list(row))
+        # As linhas vão direto para os buffers, sem montar a lista de listas
+        if linhas is not None:
+            dados = TabelaColunar.de_linhas(linhas) if compacto else list(linhas)
 
         print(f"✅ Excel lido: {arquivo} ({len(dados)} linhas)")
         return dados
 
-    def atualizar_excel(self, arquivo, linha, coluna, valor):
+    def iter_excel(self, arquivo, sheet=None, completar=True):
+        """
+        Lê um arquivo Excel linha a linha, sem carregar tudo na memória
+
+        Args:
+            arquivo: nome do arquivo .xlsx (ou .csv/.parquet, lidos direto)
+            sheet: nome da planilha (opcional)
+            completar: completa as linhas com None até a última coluna, como
+                       ler_excel. Em arquivos sem o tamanho da planilha gravado
+                       (ex.: criados por criar_excel) isso exige uma passada a
+                       mais; use False para ler só as primeiras linhas.
+
+        Yields:
+            Uma lista por linha, no mesmo formato de ler_excel
+        """
+        if eh_fonte_tabular(arquivo):
+            yield from iter_fonte(arquivo)
+            return
+
+        # Leitor fast: mesmos valores do ler_excel (o modo read_only do
+        # openpyxl não converte durações)
+        leitor = LeitorXlsx(arquivo)
+        try:
+            largura = 0
+            if completar:
+                dimensao = leitor.dimensao(sheet)
+                if dimensao:
+                    largura = dimensao[1]
+                else:
+                    # Sem <dimension> a largura vem de uma primeira passada
+                    extensao = [0, 0]
+                    deque(iter_planilha(leitor, sheet, extensao), maxlen=0)
+                    largura = extensao[1]
+
+            for linha in iter_planilha(leitor, sheet):
+                if len(linha) < largura:
+                    linha.extend([None] * (largura - len(linha)))
+                yield linha
+        finally:
+            leitor.fechar()
+
+    def converter_para_excel(self, origem, arquivo=None, encoding=None):
+        """
+        Converte um CSV ou Parquet em Excel em streaming (memória limitada)
+
+        Args:
+            origem: arquivo .csv ou .parquet
+            arquivo: nome do arquivo .xlsx (padrão: mesmo nome da origem)
+            encoding: encoding do CSV (padrão: utf-8, ou cp1252 se o arquivo não for UTF-8)
+        """
+        arquivo = arquivo or os.path.splitext(origem)[0] + ".xlsx"
+        total = converter_para_xlsx(origem, arquivo, encoding)
+        print(f"✅ Excel criado: {arquivo} ({total} linhas de {origem})")
+        return arquivo
+
+    def criar_excel_planilhas(self, arquivo, planilhas, cabecalhos=None):
+        """
+        Cria um arquivo Excel com várias planilhas
+
+        Args:
+            arquivo: nome do arquivo .xlsx
+            planilhas: dicionário {nome da planilha: dados} (dados como em criar_excel)
+            cabecalhos: dicionário {nome da planilha: lista de cabeçalhos} (opcional)
+        """
+        escrever_planilhas(arquivo, planilhas, cabecalhos)
+        print(f"✅ Excel criado: {arquivo} ({len(planilhas)} planilhas)")
+        return arquivo
+
+    def ler_excel_planilhas(self, arquivo, sheets=None, engine="openpyxl", max_workers=None):
+        """
+        Lê várias planilhas de um Excel em paralelo (um processo por planilha)
+
+        Args:
+            arquivo: nome do arquivo .xlsx
+            sheets: nomes das planilhas (padrão: todas)
+            engine: "openpyxl" (padrão) ou "fast" (ver ler_excel)
+            max_workers: número de processos (padrão: número de CPUs)
+
+        Returns:
+            Dicionário {nome da planilha: lista de listas}
+        """
+        dados = ler_planilhas(arquivo, sheets, engine, max_workers)
+        total = sum(len(linhas) for linhas in dados.values())
+        print(f"✅ Excel lido: {arquivo} ({len(dados)} planilhas, {total} linhas)")
+        return dados
+
+    def atualizar_excel(self, arquivo, linha, coluna, valor, sheet=None):
         """
         Atualiza uma célula específica do Excel
+
+        Args:
+            sheet: nome da planilha (padrão: a planilha ativa)
         """
         wb = openpyxl.load_workbook(arquivo)
-        ws = wb.active
+        ws = wb[sheet] if sheet else wb.active
         ws.cell(row=linha, column=coluna, value=valor)
         wb.save(arquivo)
         print(f"✅ Excel atualizado: célula ({linha},{coluna}) = {valor}")
 
     # ============ FUNÇÕES WORD ============
 
-    def criar_word(self, arquivo, titulo, conteudo):
+    def criar_word(self, arquivo, titulo, conteudo, tabela=None, cabecalhos_tabela=None):
         """
         Cria um documento Word formatado
 
@@ -120,6 +225,8 @@ class AgenteOfficeIA:
             arquivo: nome do arquivo .docx
             titulo: título do documento
             conteudo: texto ou lista de parágrafos
+            tabela: linhas de dados para incluir como tabela (opcional)
+            cabecalhos_tabela: lista com nomes das colunas da tabela (opcional)
         """
         doc = Document()
 
@@ -143,20 +250,32 @@ class AgenteOfficeIA:
         else:
             doc.add_paragraph(conteudo)
 
+        # Adiciona tabela de dados
+        if tabela is not None:
+            inserir_tabela(doc, tabela, cabecalhos_tabela)
+
         doc.save(arquivo)
         print(f"✅ Word criado: {arquivo}")
         return arquivo
 
-    def ler_word(self, arquivo):
+    def ler_word(self, arquivo, com_titulos=False):
         """
         Lê o conteúdo de um documento Word
+
+        Args:
+            arquivo: nome do arquivo .docx
+            com_titulos: se True, retorna tuplas (nivel, texto), onde nivel é
+                         0 para o título, N para "Heading N" e None para texto comum
         """
         doc = Document(arquivo)
         conteudo = []
 
         for para in doc.paragraphs:
             if para.text.strip():
-                conteudo.append(para.text)
+                if com_titulos:
+                    conteudo.append((_nivel_titulo(para), para.text))
+                else:
+                    conteudo.append(para.text)
 
         print(f"✅ Word lido: {arquivo} ({len(conteudo)} parágrafos)")
         return conteudo
@@ -170,6 +289,47 @@ class AgenteOfficeIA:
         doc.save(arquivo)
         print(f"✅ Conteúdo adicionado ao Word: {arquivo}")
 
+    def adicionar_tabela_word(self, arquivo, dados, cabecalhos=None):
+        """
+        Adiciona uma tabela a um documento Word existente
+
+        Args:
+            arquivo: nome do arquivo .docx
+            dados: linhas da tabela (ex.: saída de ler_excel ou iter_excel)
+            cabecalhos: lista com nomes das colunas (opcional)
+        """
+        doc = Document(arquivo)
+        tabela = inserir_tabela(doc, dados, cabecalhos)
+        doc.save(arquivo)
+        num_linhas = len(tabela.rows) if tabela is not None else 0
+        print(f"✅ Tabela adicionada ao Word: {arquivo} ({num_linhas} linhas)")
+
+    def mala_direta(self, arquivo_modelo, arquivo_excel, saida, padrao_nome="documento_{n}.docx",
+                    sheet=None, max_workers=None):
+        """
+        Gera um documento Word por linha do Excel a partir de um modelo
+
+        Args:
+            arquivo_modelo: modelo .docx com placeholders {{Coluna}}
+            arquivo_excel: planilha cuja primeira linha tem os nomes das colunas
+            saida: pasta de destino, ou arquivo .zip para gravar tudo em um único pacote
+            padrao_nome: nome de cada documento ({n} = número da linha, {{Coluna}} = valor)
+            sheet: nome da planilha (opcional)
+            max_workers: número de processos (padrão: número de CPUs)
+
+        Returns:
+            Lista com os nomes dos documentos gerados
+        """
+        linhas = self.iter_excel(arquivo_excel, sheet)
+        cabecalhos = [str(c).strip() if c is not None else "" for c in next(linhas, [])]
+        # Células vazias no fim da linha também viram campos (None), senão o
+        # placeholder ficaria no documento
+        registros = (dict(zip(cabecalhos, chain(linha, repeat(None)))) for linha in linhas)
+
+        gerados = gerar_documentos(arquivo_modelo, registros, saida, padrao_nome, max_workers)
+        print(f"✅ Mala direta concluída: {len(gerados)} documentos em {saida}")
+        return gerados
+
     # ============ FUNÇÕES IA ============
 
     @rate_limit(max_per_minute=10)
@@ -199,15 +359,56 @@ class AgenteOfficeIA:
         except Exception as e:
             return f"❌ Erro ao consultar IA: {str(e)}"
 
+    def perguntar_em_lote(self, perguntas, contexto=None, max_itens=20):
+        """
+        Responde várias perguntas curtas agrupando-as em poucas chamadas à IA
+
+        Ex.: uma classificação por linha da planilha. Cada chamada leva até
+        max_itens perguntas em espaços numerados; só as respostas que vierem
+        faltando ou malformadas são perguntadas de novo.
+
+        Args:
+            perguntas: lista de perguntas
+            contexto: informação adicional, comum a todas as perguntas
+            max_itens: número máximo de perguntas por chamada
+
+        Returns:
+            Lista de respostas, na mesma ordem das perguntas
+        """
+        if not self.model:
+            return ["Erro: API Key não configurada"] * len(perguntas)
+
+        respostas = perguntar_em_lote(self.perguntar_ia, list(perguntas), contexto, max_itens)
+        print(f"✅ {len(respostas)} perguntas respondidas em lote")
+        return respostas
+
+    def agrupador_perguntas(self, janela=0.5, contexto=None, max_itens=20):
+        """
+        Cria um agrupador para perguntas feitas por várias threads
+
+        As perguntas que chegam dentro da janela (em segundos) saem juntas
+        em uma única chamada. Uso:
+
+            with agente.agrupador_perguntas() as agrupador:
+                resposta = agrupador.perguntar("...")
+
+        Raises:
+            RuntimeError: se a API Key não estiver configurada
+        """
+        if not self.model:
+            raise RuntimeError("Erro: API Key não configurada")
+        return AgrupadorPerguntas(self.perguntar_ia, janela, contexto, max_itens)
+
     def analisar_excel_com_ia(self, arquivo):
         """
-        Lê um Excel e pede para IA analisar os dados
+        Lê um Excel (ou CSV/Parquet) e pede para IA analisar os dados
         """
-        dados = self.ler_excel(arquivo)
+        # Só as primeiras linhas vão para o prompt: não lê o arquivo inteiro
+        dados = list(islice(self.iter_excel(arquivo, completar=False), 10))
 
         prompt = f"""Analise os seguintes dados de uma planilha Excel:
 
-{json.dumps(dados[:10], ensure_ascii=False)}
+{json.dumps(dados, ensure_ascii=False, default=str)}
 
 Forneça:
 1. Um resumo dos dados
@@ -216,6 +417,121 @@ Forneça:
 
         return self.perguntar_ia(prompt)
 
+    def analisar_planilhas_com_ia(self, arquivo, sheets=None, max_workers=4):
+        """
+        Analisa várias planilhas de um Excel com IA ao mesmo tempo
+
+        As primeiras linhas de cada planilha são lidas abrindo o arquivo uma
+        vez e os prompts saem em paralelo (o rate limit continua valendo).
+
+        Args:
+            arquivo: nome do arquivo .xlsx
+            sheets: nomes das planilhas (padrão: todas)
+            max_workers: número de chamadas simultâneas à IA
+
+        Returns:
+            Dicionário {nome da planilha: análise}
+        """
+        amostras = amostras_planilhas(arquivo, sheets)
+
+        def analisar(item):
+            nome, dados = item
+            prompt = f"""Analise os seguintes dados da planilha "{nome}" de um arquivo Excel:
+
+{json.dumps(dados, ensure_ascii=False, default=str)}
+
+Forneça:
+1. Um resumo dos dados
+2. Insights principais
+3. Sugestões de análise"""
+            return nome, self.perguntar_ia(prompt)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            analises = dict(executor.map(analisar, amostras.items()))
+
+        print(f"✅ {len(analises)} planilhas analisadas")
+        return analises
+
+    def resumir_word(self, arquivo, arquivo_saida=None, max_tokens_bloco=6000, max_workers=4, arquivo_cache=None):
+        """
+        Resume um documento Word longo com IA (map-reduce)
+
+        O documento é dividido em blocos nos títulos, os blocos são resumidos
+        em paralelo (respeitando o rate limit) e os resumos são combinados em
+        níveis. Os resumos ficam em cache: ao resumir de novo um documento
+        editado, só os blocos alterados voltam para a IA.
+
+        Args:
+            arquivo: nome do arquivo .docx
+            arquivo_saida: .docx para gravar o resumo (opcional)
+            max_tokens_bloco: tamanho máximo estimado de cada bloco
+            max_workers: número de chamadas simultâneas à IA
+            arquivo_cache: JSON do cache (padrão: <arquivo>_resumos.json)
+
+        Returns:
+            Texto do resumo
+        """
+        if not self.model:
+            return "Erro: API Key não configurada"
+
+        paragrafos = self.ler_word(arquivo, com_titulos=True)
+        blocos = dividir_em_blocos(paragrafos, max_tokens_bloco)
+        print(f"📚 {len(blocos)} blocos para resumir")
+
+        cache = CacheResumos(arquivo_cache or os.path.splitext(arquivo)[0] + "_resumos.json", self.modelo)
+        try:
+            resumo, chamadas = resumir_blocos(blocos, self.perguntar_ia, cache, max_tokens_bloco, max_workers)
+        except RuntimeError as e:
+            return f"❌ Erro ao resumir: {str(e)}"
+        finally:
+            # Mesmo com erro, os blocos já resumidos ficam no cache
+            cache.salvar()
+
+        print(f"✅ Resumo gerado ({chamadas} chamadas à IA)")
+
+        if arquivo_saida:
+            self.criar_word(arquivo_saida, f"Resumo: {os.path.basename(arquivo)}", resumo.split("\n"))
+
+        return resumo
+
+    def analisar_excel_incremental(self, arquivo, sheet=None, tamanho_bloco=200, arquivo_estado=None, dados=None):
+        """
+        Analisa um Excel com IA reaproveitando o resultado da última execução
+
+        A planilha é dividida em blocos de linhas e cada bloco é identificado
+        pelo hash do seu conteúdo. Só os blocos novos ou alterados desde a
+        última execução voltam para a IA; os demais vêm do arquivo de estado.
+
+        Args:
+            arquivo: nome do arquivo .xlsx (primeira linha = cabeçalhos)
+            sheet: nome da planilha (opcional)
+            tamanho_bloco: número médio de linhas por bloco
+            arquivo_estado: JSON com as análises anteriores (padrão: <arquivo>_incremental.json)
+            dados: linhas já lidas do arquivo (ex.: TabelaColunar de ler_excel),
+                   para não ler a planilha de novo
+
+        Returns:
+            Texto do relatório
+        """
+        if not self.model:
+            return "Erro: API Key não configurada"
+
+        linhas = iter(dados) if dados is not None else self.iter_excel(arquivo, sheet)
+        cabecalhos = next(linhas, [])
+
+        cache = CacheResumos(arquivo_estado or os.path.splitext(arquivo)[0] + "_incremental.json", self.modelo)
+        try:
+            relatorio, blocos, chamadas = analisar_incremental(
+                cabecalhos, linhas, self.perguntar_ia, cache, tamanho_bloco
+            )
+        except RuntimeError as e:
+            return f"❌ Erro ao analisar: {str(e)}"
+        finally:
+            cache.salvar()
+
+        print(f"✅ Análise incremental: {blocos} blocos, {chamadas} chamadas à IA")
+        return relatorio
+
     # ============ FUNÇÕES AUTOMÁTICAS ============
 
     def relatorio_automatico(self, dados_excel, arquivo_saida="relatorio.docx"):
@@ -236,23 +552,121 @@ Forneça:
 
         return arquivo_saida
 
+    def relatorio_de_excel(self, arquivo_excel, incremental=False, arquivo_saida=None, arquivo_estado=None):
+        """
+        Lê um Excel (ou CSV/Parquet), analisa com IA e gera o relatório Word
+
+        Args:
+            arquivo_excel: arquivo de dados (primeira linha = cabeçalhos)
+            incremental: reaproveita a análise dos blocos que não mudaram
+            arquivo_saida: .docx do relatório (padrão: <arquivo>_relatorio.docx)
+            arquivo_estado: JSON do modo incremental (padrão: <arquivo>_incremental.json)
+
+        Returns:
+            Nome do relatório criado
+        """
+        # Lê Excel
+        print(f"\n📖 Lendo {arquivo_excel}...")
+        dados = self.ler_excel(arquivo_excel, compacto=True)
+
+        if incremental:
+            # Reaproveita a tabela já lida: o arquivo é lido uma vez só
+            analise = self.analisar_excel_incremental(arquivo_excel, arquivo_estado=arquivo_estado, dados=dados)
+        else:
+            # Pega amostra dos dados
+            amostra = dados[:min(20, len(dados))]
+
+            prompt = f"""Analise os dados desta planilha Excel e crie um relatório executivo completo.
+
+Dados (primeiras {len(amostra)} linhas):
+{json.dumps(amostra, ensure_ascii=False, indent=2, default=str)}
+
+Crie um relatório com:
+1. RESUMO EXECUTIVO: visão geral dos dados
+2. ANÁLISE DETALHADA: insights principais e padrões identificados
+3. ESTATÍSTICAS: números e métricas importantes
+4. CONCLUSÕES: principais descobertas
+5. RECOMENDAÇÕES: sugestões baseadas nos dados
+
+Escreva de forma profissional, objetiva e estruturada.
+Use parágrafos separados para cada seção.
+NÃO use markdown ou formatação especial."""
+
+            analise = self.perguntar_ia(prompt)
+
+        if not resumo_valido(analise):
+            raise RuntimeError(analise)
+
+        # Remove markdown se houver
+        analise = analise.replace('**', '').replace('*', '')
+
+        print(f"✅ Análise gerada ({len(analise)} caracteres)")
+
+        # Nome do relatório
+        nome_relatorio = arquivo_saida or os.path.splitext(arquivo_excel)[0] + '_relatorio.docx'
+
+        # Cria Word
+        print(f"🔧 Criando relatório {nome_relatorio}...")
+
+        titulo = f"Relatório: {os.path.basename(arquivo_excel)}"
+        paragrafos = [
+            "Este relatório foi gerado automaticamente por IA a partir da análise dos dados da planilha.",
+            "",
+            analise,
+            "",
+            "DADOS DA PLANILHA:"
+        ]
+
+        self.criar_word(
+            nome_relatorio,
+            titulo,
+            paragrafos,
+            tabela=islice(dados, 1, None),
+            cabecalhos_tabela=dados[0] if dados else None
+        )
+        return nome_relatorio
+
     def pipeline_completo(self, dados, nome_projeto="projeto"):
         """
         Executa um pipeline completo: Excel -> IA -> Word
+
+        Args:
+            dados: lista de listas (colunas ID, Descrição, Valor, Status), DataFrame
+                   pandas, array NumPy ou Table Arrow (cabeçalhos das colunas), ou
+                   caminho de um .csv/.parquet (com cabeçalho)
+            nome_projeto: prefixo dos arquivos gerados
         """
         print(f"\n🚀 Iniciando pipeline: {nome_projeto}")
 
         # 1. Cria Excel
         arquivo_excel = f"{nome_projeto}.xlsx"
-        self.criar_excel(
-            arquivo_excel,
-            dados,
-            cabecalhos=["ID", "Descrição", "Valor", "Status"]
-        )
+        if isinstance(dados, str) and eh_fonte_tabular(dados):
+            # A análise lê a fonte direto; o .xlsx é gerado em streaming
+            fonte = dados
+            self.converter_para_excel(fonte, arquivo_excel)
+            linhas = self.iter_excel(fonte)
+            cabecalhos = next(linhas, None)
+            dados = linhas
+        elif eh_colunar(dados):
+            # DataFrame, array NumPy ou Table Arrow: cabeçalhos e linhas da
+            # tabela Word vêm das próprias colunas
+            fonte = arquivo_excel
+            cabecalhos, colunas = preparar_colunas(dados)
+            cabecalhos = cabecalhos or [f"Coluna {j}" for j in range(1, len(colunas) + 1)]
+            self.criar_excel(arquivo_excel, dados, cabecalhos=cabecalhos)
+            dados = linhas_colunares(None, colunas)
+        else:
+            fonte = arquivo_excel
+            cabecalhos = ["ID", "Descrição", "Valor", "Status"]
+            self.criar_excel(
+                arquivo_excel,
+                dados,
+                cabecalhos=cabecalhos
+            )
 
         # 2. Analisa com IA
         print("\n🤖 Analisando dados com IA...")
-        analise = self.analisar_excel_com_ia(arquivo_excel)
+        analise = self.analisar_excel_com_ia(fonte)
 
         # 3. Cria relatório Word
         arquivo_word = f"{nome_projeto}_relatorio.docx"
@@ -263,8 +677,12 @@ Forneça:
                 "Este relatório foi gerado automaticamente pelo agente.",
                 "",
                 "ANÁLISE DOS DADOS:",
-                analise
-            ]
+                analise,
+                "",
+                "DADOS:"
+            ],
+            tabela=dados,
+            cabecalhos_tabela=cabecalhos
         )
 
         print(f"\n✨ Pipeline concluído!")
@@ -276,6 +694,17 @@ Forneça:
 
 # ============ FUNÇÃO AUXILIAR ============
 
+def _nivel_titulo(paragrafo):
+    """Nível de título do parágrafo (0 = Title, N = Heading N) ou None"""
+    nome = paragrafo.style.name if paragrafo.style is not None else ""
+    if nome == "Title":
+        return 0
+    if nome.startswith("Heading "):
+        nivel = nome[len("Heading "):]
+        return int(nivel) if nivel.isdigit() else None
+    return None
+
+
 def abrir_arquivo(arquivo):
     """Abre arquivo no programa padrão do sistema operacional"""
     if platform.system() == 'Windows':
@@ -0,0 +1,279 @@
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, time as hora, timedelta
+import openpyxl
+from docx import Document
+from openpyxl.cell.rich_text import CellRichText, TextBlock
+from openpyxl.cell.text import InlineFont
+from openpyxl.worksheet.formula import ArrayFormula
+from leitor_xlsx import ler_xlsx
+from planilhas import ler_planilhas
+from tabela_word import inserir_tabela
+
+
+def _cronometrar(funcao, *args):
+    """Executa a função e retorna o tempo gasto em segundos"""
+    inicio = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - inicio
+
+
+def _dados_exemplo(num_linhas, num_colunas=4):
+    """Gera linhas no formato de ler_excel"""
+    status = ["Concluído", "Pendente", "Em Análise"]
+    return [
+        [i, f"Produto {i}", 100.5 * i, status[i % 3]][:num_colunas]
+        for i in range(num_linhas)
+    ]
+
+
+# ============ TABELAS WORD ============
+
+def _tabela_celula_a_celula(dados, cabecalhos):
+    doc = Document()
+    tabela = doc.add_table(rows=1, cols=len(cabecalhos))
+    tabela.style = "Table Grid"
+    for i, nome in enumerate(cabecalhos):
+        tabela.cell(0, i).text = str(nome)
+    for linha in dados:
+        celulas = tabela.add_row().cells
+        for i, valor in enumerate(linha):
+            celulas[i].text = str(valor)
+    return doc
+
+
+def _tabela_uma_passada(dados, cabecalhos):
+    doc = Document()
+    inserir_tabela(doc, dados, cabecalhos)
+    return doc
+
+
+def benchmark_tabela_word(tamanhos=(250, 1000, 20000)):
+    """Compara inserir_tabela com a API célula a célula do python-docx"""
+    print("\n📊 Tabela Word: python-docx célula a célula x inserir_tabela")
+    cabecalhos = ["ID", "Produto", "Valor (R$)", "Status"]
+
+    for num_linhas in tamanhos:
+        dados = _dados_exemplo(num_linhas)
+        rapido = _cronometrar(_tabela_uma_passada, dados, cabecalhos)
+
+        # A API célula a célula é quadrática: só roda nos tamanhos menores
+        if num_linhas <= 1000:
+            lento = _cronometrar(_tabela_celula_a_celula, dados, cabecalhos)
+            print(f"   {num_linhas:>6} linhas: {lento:8.2f}s x {rapido:6.2f}s ({lento / rapido:.0f}x)")
+        else:
+            print(f"   {num_linhas:>6} linhas: {'-':>8}  x {rapido:6.2f}s")
+
+
+# ============ LEITURA EXCEL ============
+
+def _ler_openpyxl(arquivo, sheet=None):
+    """Mesma leitura de ler_excel(engine="openpyxl")"""
+    wb = openpyxl.load_workbook(arquivo)
+    ws = wb[sheet] if sheet else wb.active
+    return [list(row) for row in ws.iter_rows(values_only=True)]
+
+
+def _normalizar(valor):
+    # Fórmulas de matriz são objetos sem __eq__
+    if isinstance(valor, ArrayFormula):
+        return ("ArrayFormula", valor.ref, valor.text)
+    return valor
+
+
+def _planilhas_conformidade(pasta):
+    """Gera o conjunto de planilhas usado para comparar as duas engines"""
+    casos = []
+
+    # Tipos básicos, lacunas, mesclagem, hyperlink, fórmulas e texto rico
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["ID", "Texto", "Valor", "Ativo", "Data", "Data/hora", "Hora", "Duração"])
+    ws.append([1, "Produto A", 1500.5, True, date(2024, 1, 2), datetime(2024, 1, 2, 13, 45), hora(8, 30),
+               timedelta(hours=30)])
+    ws.append([2, "  espaços  ", -3, False, None, datetime(1900, 3, 1), None, None])
+    ws.append([3, "Acentuação ç ã é", 1e-9, None, date(1999, 12, 31), None, None, None])
+    ws["B8"] = "linha depois de lacuna"
+    ws["E10"] = None
+    ws["E10"].font = openpyxl.styles.Font(bold=True)  # célula vazia com estilo
+    ws["A12"] = "=SUM(A2:A4)"
+    ws["B12"] = ArrayFormula("B12:B13", "=A2:A3*2")
+    ws["C12"] = CellRichText("normal ", TextBlock(InlineFont(b=True), "negrito"))
+    ws["D12"] = 12345678901234
+    ws["A14"].hyperlink = "https://example.com"
+    ws["A14"] = "link"
+    ws.merge_cells("F16:J18")
+    ws["F16"] = "mesclada"
+    ws.cell(row=20, column=1, value="x" * 1000)
+    arquivo = os.path.join(pasta, "tipos.xlsx")
+    wb.save(arquivo)
+    casos.append((arquivo, None))
+
+    # Várias planilhas, planilha ativa que não é a primeira e planilha vazia
+    wb = openpyxl.Workbook()
+    wb.active.append(["primeira"])
+    segunda = wb.create_sheet("Segunda")
+    segunda["C3"] = "ativa"
+    wb.create_sheet("Vazia")
+    wb.active = 1
+    arquivo = os.path.join(pasta, "planilhas.xlsx")
+    wb.save(arquivo)
+    casos += [(arquivo, None), (arquivo, "Sheet"), (arquivo, "Vazia")]
+
+    # Gravada em modo write_only (como criar_excel): sem <dimension> e com
+    # linhas de tamanhos diferentes
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Dados")
+    for linha in (["a", "b"], [1], [], [None, 2.5, None, timedelta(days=2)], []):
+        ws.append(linha)
+    arquivo = os.path.join(pasta, "write_only.xlsx")
+    wb.save(arquivo)
+    casos.append((arquivo, None))
+
+    # Calendário 1904
+    wb = openpyxl.Workbook()
+    wb.epoch = openpyxl.utils.datetime.CALENDAR_MAC_1904
+    wb.active.append([date(2024, 5, 6), datetime(2010, 1, 1, 12, 0)])
+    arquivo = os.path.join(pasta, "epoch1904.xlsx")
+    wb.save(arquivo)
+    casos.append((arquivo, None))
+
+    return casos
+
+
+def _conferir(nome, esperado, obtido, rotulo="fast"):
+    """Compara duas leituras linha a linha e mostra as diferenças"""
+    esperado = [[_normalizar(v) for v in linha] for linha in esperado]
+    obtido = [[_normalizar(v) for v in linha] for linha in obtido]
+    if esperado == obtido:
+        print(f"   ✅ {nome}")
+        return True
+    print(f"   ❌ {nome}")
+    for i, (a, b) in enumerate(zip(esperado, obtido), 1):
+        if a != b:
+            print(f"      linha {i}: openpyxl={a} {rotulo}={b}")
+    if len(esperado) != len(obtido):
+        print(f"      linhas: openpyxl={len(esperado)} {rotulo}={len(obtido)}")
+    return False
+
+
+def verificar_conformidade_leitor():
+    """Confere se engine="fast", iter_excel e ler_excel_planilhas devolvem o mesmo que o openpyxl no conjunto de teste"""
+    print("\n🔍 Conformidade: engine fast x openpyxl")
+    falhas = 0
+    with tempfile.TemporaryDirectory() as pasta:
+        casos = _planilhas_conformidade(pasta)
+        for arquivo, sheet in casos:
+            nome = f"{os.path.basename(arquivo)}[{sheet or 'ativa'}]"
+            falhas += not _conferir(nome, _ler_openpyxl(arquivo, sheet), ler_xlsx(arquivo, sheet))
+
+        # iter_excel: mesmas linhas do ler_excel, em streaming
+        from agent import AgenteOfficeIA
+        agente = AgenteOfficeIA.__new__(AgenteOfficeIA)  # sem API: só leitura
+        for arquivo, sheet in casos:
+            nome = f"{os.path.basename(arquivo)}[{sheet or 'ativa'}] iter_excel"
+            falhas += not _conferir(nome, _ler_openpyxl(arquivo, sheet), agente.iter_excel(arquivo, sheet), "iter")
+
+        # ler_excel_planilhas: cada planilha igual à do ler_excel, nas duas engines
+        for arquivo in dict.fromkeys(arquivo for arquivo, _ in casos):
+            for engine in ("openpyxl", "fast"):
+                lidas = ler_planilhas(arquivo, engine=engine, max_workers=2)
+                for sheet, linhas in lidas.items():
+                    nome = f"{os.path.basename(arquivo)}[{sheet}] ler_planilhas({engine})"
+                    falhas += not _conferir(nome, _ler_openpyxl(arquivo, sheet), linhas, "planilhas")
+    return falhas == 0
+
+
+def benchmark_leitor_excel(tamanhos=(10000, 100000)):
+    """Compara ler_excel com engine openpyxl e fast"""
+    if not verificar_conformidade_leitor():
+        return
+
+    print("\n📖 Leitura Excel: engine openpyxl x fast")
+    with tempfile.TemporaryDirectory() as pasta:
+        for num_linhas in tamanhos:
+            arquivo = os.path.join(pasta, f"dados_{num_linhas}.xlsx")
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet()
+            ws.append(["ID", "Produto", "Valor (R$)", "Status", "Data"])
+            inicio = datetime(2024, 1, 1)
+            for linha in _dados_exemplo(num_linhas):
+                ws.append(linha + [inicio + timedelta(days=linha[0] % 365)])
+            wb.save(arquivo)
+
+            lento = _cronometrar(_ler_openpyxl, arquivo)
+            rapido = _cronometrar(ler_xlsx, arquivo)
+            print(f"   {num_linhas:>6} linhas: {lento:8.2f}s x {rapido:6.2f}s ({lento / rapido:.1f}x)")
+
+
+# ============ MEMÓRIA ============
+
+def _linhas_largas(num_linhas):
+    """Linhas de 20 colunas: ids, valores, quantidades, datas e textos repetidos"""
+    cidades = ["São Paulo", "Rio de Janeiro", "Belo Horizonte", "Curitiba", "Recife"]
+    status = ["Concluído", "Pendente", "Em Análise"]
+    inicio = datetime(2024, 1, 1)
+    yield [f"Coluna {j}" for j in range(20)]
+    for i in range(num_linhas):
+        yield [
+            i, f"Cliente {i % 5000}", cidades[i % 5], status[i % 3], inicio + timedelta(minutes=i),
+            100.5 * i, i % 97, 3.25 * (i % 11), None if i % 7 else "obs", i * 3,
+            f"SKU-{i % 800:04d}", 0.1 * i, i % 2, cidades[(i + 2) % 5], inicio + timedelta(days=i % 365),
+            i * 1.5, i % 13, status[(i + 1) % 3], 7.5, i + 0.25,
+        ]
+
+
+def _memoria_leitura(agente, arquivo, **opcoes):
+    """Pico de memória (bytes) durante ler_excel e memória que o resultado mantém"""
+    tracemalloc.start()
+    dados = agente.ler_excel(arquivo, **opcoes)
+    gc.collect()  # o Workbook do openpyxl tem referências circulares
+    atual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del dados
+    return pico, atual
+
+
+def benchmark_memoria(tamanhos=(5000, 20000)):
+    """Compara a memória de ler_excel com e sem compacto=True (planilha de 20 colunas)"""
+    from agent import AgenteOfficeIA
+
+    agente = AgenteOfficeIA.__new__(AgenteOfficeIA)  # sem API: só leitura
+    variantes = [
+        ("lista de listas", {}),
+        ("compacto", {"compacto": True}),
+    ]
+
+    print("\n💾 Memória de ler_excel: lista de listas x TabelaColunar (20 colunas)")
+    with tempfile.TemporaryDirectory() as pasta:
+        for num_linhas in tamanhos:
+            arquivo = os.path.join(pasta, f"largo_{num_linhas}.xlsx")
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet()
+            for linha in _linhas_largas(num_linhas):
+                ws.append(linha)
+            wb.save(arquivo)
+
+            print(f"   {num_linhas} linhas:")
+            for nome, opcoes in variantes:
+                pico, atual = _memoria_leitura(agente, arquivo, **opcoes)
+                print(f"      {nome:<16} pico {pico / 2**20:7.1f} MB | resultado {atual / 2**20:6.1f} MB "
+                      f"({atual / (num_linhas * 20):.0f} bytes/célula)")
+
+
+BENCHMARKS = {
+    "tabela_word": benchmark_tabela_word,
+    "leitor_excel": benchmark_leitor_excel,
+    "memoria": benchmark_memoria,
+}
+
+
+if __name__ == "__main__":
+    # Uso: python benchmark.py [nome ...]
+    nomes = sys.argv[1:] or list(BENCHMARKS)
+    for nome in nomes:
+        BENCHMARKS[nome]()
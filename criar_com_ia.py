@@ -266,14 +266,14 @@ def analisar_excel_e_gerar_relatorio():
 
     agente = AgenteOfficeIA(api_key=api_key)
 
-    # Lista arquivos Excel
-    arquivos_excel = [f for f in os.listdir('.') if f.endswith('.xlsx')]
+    # Lista arquivos Excel (e CSV/Parquet, lidos direto sem conversão)
+    arquivos_excel = [f for f in os.listdir('.') if f.endswith(('.xlsx', '.csv', '.parquet'))]
 
     if not arquivos_excel:
-        print("\n⚠️  Nenhum arquivo Excel encontrado no diretório atual")
+        print("\n⚠️  Nenhum arquivo Excel, CSV ou Parquet encontrado no diretório atual")
         return
 
-    print("\n📋 Arquivos Excel disponíveis:")
+    print("\n📋 Arquivos disponíveis:")
     for i, arquivo in enumerate(arquivos_excel, 1):
         print(f"   {i}. {arquivo}")
 
@@ -289,64 +289,23 @@ def analisar_excel_e_gerar_relatorio():
             return
     else:
         arquivo_excel = escolha
-        if not arquivo_excel.endswith('.xlsx'):
+        if not arquivo_excel.endswith(('.xlsx', '.csv', '.parquet')):
             arquivo_excel += '.xlsx'
 
     if not os.path.exists(arquivo_excel):
         print(f"❌ Arquivo '{arquivo_excel}' não encontrado!")
         return
 
-    # Lê Excel
-    print(f"\n📖 Lendo {arquivo_excel}...")
-    dados = agente.ler_excel(arquivo_excel)
+    # Modo incremental: só os blocos alterados desde a última execução vão para a IA
+    incremental = input("\n♻️  Modo incremental (reaproveita a análise anterior)? (s/n): ").strip().lower()
+    incremental = incremental in ['s', 'sim', 'y', 'yes']
 
-    print(f"✅ {len(dados)} linhas lidas")
-
-    # Analisa com IA
+    # Analisa com IA e cria o Word
     print("\n🤖 Analisando dados com IA...")
     print("⏳ Aguarde...")
 
-    # Pega amostra dos dados
-    amostra = dados[:min(20, len(dados))]
-
-    prompt = f"""Analise os dados desta planilha Excel e crie um relatório executivo completo.
-
-Dados (primeiras {len(amostra)} linhas):
-{json.dumps(amostra, ensure_ascii=False, indent=2)}
-
-Crie um relatório com:
-1. RESUMO EXECUTIVO: visão geral dos dados
-2. ANÁLISE DETALHADA: insights principais e padrões identificados
-3. ESTATÍSTICAS: números e métricas importantes
-4. CONCLUSÕES: principais descobertas
-5. RECOMENDAÇÕES: sugestões baseadas nos dados
-
-Escreva de forma profissional, objetiva e estruturada.
-Use parágrafos separados para cada seção.
-NÃO use markdown ou formatação especial."""
-
     try:
-        analise = agente.perguntar_ia(prompt)
-
-        # Remove markdown se houver
-        analise = analise.replace('**', '').replace('*', '')
-
-        print(f"\n✅ Análise gerada ({len(analise)} caracteres)")
-
-        # Nome do relatório
-        nome_relatorio = arquivo_excel.replace('.xlsx', '_relatorio.docx')
-
-        # Cria Word
-        print(f"\n🔧 Criando relatório {nome_relatorio}...")
-
-        titulo = f"Relatório: {arquivo_excel}"
-        paragrafos = [
-            "Este relatório foi gerado automaticamente por IA a partir da análise dos dados da planilha.",
-            "",
-            analise
-        ]
-
-        agente.criar_word(nome_relatorio, titulo, paragrafos)
+        nome_relatorio = agente.relatorio_de_excel(arquivo_excel, incremental=incremental)
 
         # Pergunta se quer abrir
         abrir = input("\n📂 Abrir relatório agora? (s/n): ").strip().lower()
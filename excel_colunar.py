@@ -0,0 +1,242 @@
+import sys
+from collections.abc import Sequence
+from itertools import chain, islice
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.utils import get_column_letter
+
+# numpy, pandas e pyarrow são opcionais: os dados são reconhecidos pelos
+# atributos e o numpy só é importado quando a entrada é colunar.
+
+# Linhas convertidas por vez (limita a memória dos valores Python)
+TAMANHO_LOTE = 65536
+
+# Linhas usadas para estimar a largura das colunas quando os dados são um
+# iterador (só podem ser percorridos uma vez)
+AMOSTRA_LARGURAS = 1000
+
+FORMATO_DECIMAL = "#,##0.00"
+FORMATO_DATA = "dd/mm/yyyy"
+FORMATO_DATA_HORA = "dd/mm/yyyy hh:mm"
+
+
+def eh_colunar(dados):
+    """Indica se os dados são um array NumPy, DataFrame pandas ou Table Arrow"""
+    return (
+        (hasattr(dados, "columns") and hasattr(dados, "iloc"))             # pandas
+        or (hasattr(dados, "column_names") and hasattr(dados, "to_batches"))  # pyarrow
+        or (hasattr(dados, "dtype") and hasattr(dados, "ndim"))            # numpy
+    )
+
+
+def preparar_colunas(dados, cabecalhos=None):
+    """
+    Separa os dados colunares em uma lista de arrays NumPy, um por coluna
+
+    Returns:
+        (cabecalhos, colunas)
+    """
+    import numpy as np
+
+    if hasattr(dados, "iloc"):
+        colunas = []
+        for j in range(dados.shape[1]):
+            serie = dados.iloc[:, j]
+            if getattr(serie.dtype, "tz", None) is not None:
+                # O Excel não guarda fuso: datas com fuso viram UTC sem fuso
+                serie = serie.dt.tz_convert(None)
+            if isinstance(serie.dtype, np.dtype):
+                colunas.append(serie.to_numpy())
+            else:
+                # Tipos de extensão (Int64, string, category...): nulos viram None
+                colunas.append(serie.to_numpy(dtype=object, na_value=None))
+        nomes = [str(c) for c in dados.columns]
+    elif hasattr(dados, "column_names"):
+        colunas = [dados.column(j).to_numpy() for j in range(dados.num_columns)]
+        nomes = list(dados.column_names)
+    else:
+        arr = np.asarray(dados)
+        if arr.dtype.names:
+            colunas = [arr[nome] for nome in arr.dtype.names]
+            nomes = list(arr.dtype.names)
+        elif arr.ndim == 1:
+            colunas = [arr]
+            nomes = None
+        else:
+            colunas = [arr[:, j] for j in range(arr.shape[1])]
+            nomes = None
+
+    return (cabecalhos if cabecalhos is not None else nomes), colunas
+
+
+def _tem_hora(coluna):
+    import numpy as np
+    dias = coluna.astype("datetime64[D]")
+    validos = ~np.isnat(coluna)
+    return bool((coluna[validos] != dias[validos]).any())
+
+
+def formato_coluna(coluna):
+    """Formato numérico da coluna a partir do dtype (None = Geral)"""
+    if coluna.dtype.kind == "f":
+        return FORMATO_DECIMAL
+    if coluna.dtype.kind == "M":
+        return FORMATO_DATA_HORA if _tem_hora(coluna) else FORMATO_DATA
+    return None
+
+
+def largura_coluna(coluna):
+    """Maior largura de exibição da coluna, calculada com reduções vetorizadas"""
+    import numpy as np
+
+    if not len(coluna):
+        return 0
+
+    tipo = coluna.dtype.kind
+    if tipo in "iu":
+        return max(len(str(coluna.min())), len(str(coluna.max())))
+    if tipo == "b":
+        return len("False")
+    if tipo == "f":
+        finitos = coluna[np.isfinite(coluna)]
+        if not len(finitos):
+            return 0
+        return max(len(f"{finitos.min():,.2f}"), len(f"{finitos.max():,.2f}"))
+    if tipo == "M":
+        return len("00/00/0000 00:00") if _tem_hora(coluna) else len("00/00/0000")
+    if tipo in "US":
+        return int(np.char.str_len(coluna).max())
+    return max((len(str(v)) for v in coluna if v is not None), default=0)
+
+
+def _valores(coluna):
+    """Converte uma fatia da coluna em valores Python, com NaN/NaT -> None"""
+    import numpy as np
+
+    tipo = coluna.dtype.kind
+    if tipo == "f":
+        nulos = np.isnan(coluna)
+        if nulos.any():
+            coluna = coluna.astype(object)
+            coluna[nulos] = None
+        return coluna.tolist()
+    if tipo == "M":
+        # NaT vira None no tolist()
+        return coluna.astype("datetime64[us]").tolist()
+    if tipo == "O":
+        # pd.NA não pode ser comparado (v != v levanta TypeError): é
+        # reconhecido pela identidade, se o pandas estiver carregado
+        na = getattr(sys.modules.get("pandas"), "NA", None)
+        return [None if (v is None or v is na or v != v) else v for v in coluna.tolist()]
+    if tipo == "S":
+        return [v.decode("utf-8", "replace") for v in coluna.tolist()]
+    return coluna.tolist()
+
+
+def linhas_colunares(ws, colunas, formatos=None):
+    """
+    Gera as linhas (tuplas) para ws.append, convertendo as colunas em lotes
+
+    Args:
+        ws: planilha em modo write_only (só usada com formatos)
+        colunas: lista de arrays NumPy
+        formatos: formato numérico de cada coluna (ou None); sem formatos as
+                  linhas têm só valores Python (ex.: para uma tabela Word)
+    """
+    num_linhas = len(colunas[0]) if colunas else 0
+    formatos = formatos or [None] * len(colunas)
+
+    for inicio in range(0, num_linhas, TAMANHO_LOTE):
+        lote = []
+        for coluna, formato in zip(colunas, formatos):
+            valores = _valores(coluna[inicio:inicio + TAMANHO_LOTE])
+            if formato:
+                valores = [_celula(ws, v, formato) for v in valores]
+            lote.append(valores)
+        yield from zip(*lote)
+
+
+def _celula(ws, valor, formato):
+    if valor is None:
+        return None
+    celula = WriteOnlyCell(ws, value=valor)
+    celula.number_format = formato
+    return celula
+
+
+def larguras_linhas(dados, cabecalhos=None):
+    """Maior largura de exibição de cada coluna para dados em lista de listas"""
+    larguras = [len(str(c)) for c in cabecalhos] if cabecalhos else []
+    for linha in dados:
+        if len(linha) > len(larguras):
+            larguras.extend([0] * (len(linha) - len(larguras)))
+        for j, valor in enumerate(linha):
+            if valor is not None:
+                tamanho = len(str(valor))
+                if tamanho > larguras[j]:
+                    larguras[j] = tamanho
+    return larguras
+
+
+def ajustar_larguras(ws, larguras):
+    """Define a largura das colunas (no modo write_only, antes das linhas)"""
+    for i, largura in enumerate(larguras, 1):
+        ws.column_dimensions[get_column_letter(i)].width = largura + 2
+
+
+def linha_cabecalho(ws, cabecalhos):
+    """Células de cabeçalho formatadas para ws.append"""
+    linha = []
+    for nome in cabecalhos:
+        cell = WriteOnlyCell(ws, value=nome)
+        cell.font = Font(bold=True, color="FFFFFF")
+        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.alignment = Alignment(horizontal="center")
+        linha.append(cell)
+    return linha
+
+
+def escrever_planilha(ws, dados, cabecalhos=None):
+    """
+    Grava cabeçalhos e linhas em uma planilha write_only (uma única passada)
+
+    Args:
+        ws: planilha em modo write_only
+        dados: lista de listas (ou qualquer iterável de linhas), TabelaColunar, array NumPy,
+               DataFrame pandas ou Table Arrow
+        cabecalhos: lista com nomes das colunas (padrão para DataFrame/Arrow: nomes das colunas)
+    """
+    if eh_colunar(dados):
+        cabecalhos, colunas = preparar_colunas(dados, cabecalhos)
+    else:
+        colunas = None
+
+    # Dados colunares: tipos, formatos e larguras calculados por coluna
+    if colunas is not None:
+        formatos = [formato_coluna(coluna) for coluna in colunas]
+        larguras = [largura_coluna(coluna) for coluna in colunas]
+        if cabecalhos:
+            larguras = [max(largura, len(str(c))) for largura, c in zip(larguras, cabecalhos)]
+        linhas = linhas_colunares(ws, colunas, formatos)
+    elif isinstance(dados, Sequence):
+        # Inclui a TabelaColunar (ler_excel com compacto=True): sai com o
+        # mesmo formato que a lista de listas equivalente
+        larguras = larguras_linhas(dados, cabecalhos)
+        linhas = dados
+    else:
+        # Geradores (iter_excel, iter_fonte...): as larguras vêm de uma
+        # amostra, que volta para a frente das linhas
+        linhas = iter(dados)
+        amostra = list(islice(linhas, AMOSTRA_LARGURAS))
+        larguras = larguras_linhas(amostra, cabecalhos)
+        linhas = chain(amostra, linhas)
+
+    # Ajusta largura das colunas (no modo write_only, antes das linhas)
+    ajustar_larguras(ws, larguras)
+
+    # Adiciona cabeçalhos formatados se fornecidos
+    if cabecalhos:
+        ws.append(linha_cabecalho(ws, cabecalhos))
+
+    for linha in linhas:
+        ws.append(linha)
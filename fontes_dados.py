@@ -0,0 +1,188 @@
+import codecs
+import csv
+import os
+import re
+from itertools import chain, islice
+import openpyxl
+from excel_colunar import (AMOSTRA_LARGURAS, ajustar_larguras, formato_coluna, largura_coluna,
+                           larguras_linhas, linha_cabecalho, linhas_colunares)
+
+# Fontes tabulares lidas em streaming além do .xlsx.
+# pyarrow é opcional: só é importado quando a fonte é Parquet.
+
+EXTENSOES_CSV = (".csv", ".txt")
+EXTENSOES_PARQUET = (".parquet", ".pq")
+
+# Linhas por lote lido do Parquet
+TAMANHO_LOTE = 65536
+
+# Linhas do CSV usadas para decidir o tipo de cada coluna
+AMOSTRA_TIPOS = 1000
+
+# Bytes lidos para detectar o encoding e o separador do CSV
+TAMANHO_AMOSTRA_CSV = 64 * 1024
+
+# Números aceitos na conversão de campos CSV. Zeros à esquerda (CEP,
+# códigos) não casam e continuam como texto.
+_INTEIRO = re.compile(r"-?(0|[1-9]\d*)")
+_DECIMAL = re.compile(r"-?(0|[1-9]\d*)\.\d+([eE][-+]?\d+)?")
+# Formato brasileiro (CSV com ";"): 1.234 e 1.234,56
+_INTEIRO_BR = re.compile(r"-?[1-9]\d{0,2}(\.\d{3})+")
+_DECIMAL_BR = re.compile(r"-?(0|[1-9]\d*|[1-9]\d{0,2}(\.\d{3})+),\d+")
+
+
+def eh_fonte_tabular(arquivo):
+    """Indica se o arquivo é CSV ou Parquet (e não .xlsx)"""
+    extensao = os.path.splitext(str(arquivo))[1].lower()
+    return extensao in EXTENSOES_CSV or extensao in EXTENSOES_PARQUET
+
+
+def _converter_csv(valor, decimal):
+    """Converte o texto de um campo CSV em int/float quando for número"""
+    if not valor:
+        return None
+    if _INTEIRO.fullmatch(valor):
+        return int(valor)
+    if decimal == ",":
+        if _DECIMAL_BR.fullmatch(valor):
+            return float(valor.replace(".", "").replace(",", "."))
+        if _INTEIRO_BR.fullmatch(valor):
+            return int(valor.replace(".", ""))
+    elif _DECIMAL.fullmatch(valor):
+        return float(valor)
+    return valor
+
+
+def _detectar_encoding(arquivo):
+    """utf-8 (com ou sem BOM) ou cp1252, o padrão do Excel ao salvar CSV em português"""
+    with open(arquivo, "rb") as f:
+        bruto = f.read(TAMANHO_AMOSTRA_CSV)
+    try:
+        # final=False: um caractere cortado no fim da amostra não é erro
+        codecs.getincrementaldecoder("utf-8")().decode(bruto, final=False)
+    except UnicodeDecodeError:
+        return "cp1252"
+    return "utf-8-sig"
+
+
+def _colunas_numericas(amostra, decimal):
+    """Indica, por coluna, se todos os valores preenchidos da amostra são números"""
+    numericas = []
+    for j in range(max(map(len, amostra), default=0)):
+        valores = [linha[j] for linha in amostra if j < len(linha) and linha[j]]
+        numericas.append(bool(valores) and not any(isinstance(_converter_csv(v, decimal), str) for v in valores))
+    return numericas
+
+
+def _iter_csv(arquivo, encoding=None):
+    with open(arquivo, newline="", encoding=encoding or _detectar_encoding(arquivo)) as f:
+        amostra = f.read(TAMANHO_AMOSTRA_CSV)
+        f.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t|")
+        except csv.Error:
+            dialeto = csv.excel
+
+        # Planilhas exportadas em português usam ";" e vírgula decimal
+        decimal = "," if dialeto.delimiter == ";" else "."
+
+        leitor = csv.reader(f, dialeto)
+        cabecalhos = next(leitor, None)
+        if cabecalhos is None:
+            return
+        yield cabecalhos
+
+        # O tipo vem da coluna, não da célula: basta um texto na amostra (ex.:
+        # CEP com zero à esquerda) para a coluna inteira continuar como texto.
+        # Depois da amostra, um valor que não é número fica como texto
+        linhas = list(islice(leitor, AMOSTRA_TIPOS))
+        numericas = _colunas_numericas(linhas, decimal)
+        for linha in chain(linhas, leitor):
+            yield [
+                _converter_csv(valor, decimal) if j < len(numericas) and numericas[j] else (valor or None)
+                for j, valor in enumerate(linha)
+            ]
+
+
+def _iter_parquet(arquivo):
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(arquivo)
+    yield list(parquet.schema_arrow.names)
+    for lote in parquet.iter_batches(batch_size=TAMANHO_LOTE):
+        colunas = [coluna.to_pylist() for coluna in lote.columns]
+        yield from map(list, zip(*colunas))
+
+
+def iter_fonte(arquivo, encoding=None):
+    """
+    Lê um CSV ou Parquet linha a linha, no mesmo formato de iter_excel
+
+    A primeira linha são os nomes das colunas. O encoding do CSV (padrão:
+    utf-8, ou cp1252 se o começo do arquivo não for UTF-8) pode ser forçado.
+    """
+    extensao = os.path.splitext(str(arquivo))[1].lower()
+    if extensao in EXTENSOES_PARQUET:
+        return _iter_parquet(arquivo)
+    return _iter_csv(arquivo, encoding)
+
+
+def converter_para_xlsx(origem, destino, encoding=None):
+    """
+    Converte CSV/Parquet em .xlsx em streaming, com memória limitada
+
+    O Excel é escrito em modo write_only: as linhas vão direto para o
+    arquivo e só uma amostra (CSV) ou um lote (Parquet) fica em memória
+    para calcular a largura das colunas. encoding vale para CSV (ver iter_fonte).
+
+    Returns:
+        Número de linhas de dados gravadas
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    total = 0
+
+    extensao = os.path.splitext(str(origem))[1].lower()
+    if extensao in EXTENSOES_PARQUET:
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(origem)
+        nomes = parquet.schema_arrow.names
+        formatos = None
+        for lote in parquet.iter_batches(batch_size=TAMANHO_LOTE):
+            colunas = [coluna.to_numpy(zero_copy_only=False) for coluna in lote.columns]
+
+            # Formatos e larguras vêm do primeiro lote
+            if formatos is None:
+                formatos = [formato_coluna(coluna) for coluna in colunas]
+                ajustar_larguras(ws, [max(largura_coluna(c), len(str(n))) for c, n in zip(colunas, nomes)])
+                ws.append(linha_cabecalho(ws, nomes))
+
+            for linha in linhas_colunares(ws, colunas, formatos):
+                ws.append(linha)
+            total += lote.num_rows
+
+        if formatos is None:
+            ajustar_larguras(ws, [len(str(n)) for n in nomes])
+            ws.append(linha_cabecalho(ws, nomes))
+    else:
+        linhas = _iter_csv(origem, encoding)
+        cabecalhos = next(linhas, None)
+        if cabecalhos is not None:
+            amostra = []
+            for linha in linhas:
+                amostra.append(linha)
+                if len(amostra) >= AMOSTRA_LARGURAS:
+                    break
+            ajustar_larguras(ws, larguras_linhas(amostra, cabecalhos))
+            ws.append(linha_cabecalho(ws, cabecalhos))
+
+            for linha in amostra:
+                ws.append(linha)
+            total = len(amostra)
+            for linha in linhas:
+                ws.append(linha)
+                total += 1
+
+    wb.save(destino)
+    return total
@@ -0,0 +1,339 @@
+import posixpath
+import zipfile
+from lxml import etree
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+from openpyxl.worksheet.formula import ArrayFormula, DataTableFormula
+from tabela_colunar import TabelaColunar
+
+# Leitor alternativo de .xlsx (engine="fast" em ler_excel)
+#
+# Lê o XML da planilha direto do zip com iterparse, sem criar objetos Cell.
+# As strings compartilhadas e os estilos de data são carregados uma vez em
+# listas/conjuntos e cada linha vira uma tupla de valores Python. As regras de
+# conversão seguem as do leitor do openpyxl (números, datas, booleanos,
+# fórmulas, strings inline) para que o resultado seja o mesmo.
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+TAG_ROW = f"{NS}row"
+TAG_C = f"{NS}c"
+TAG_V = f"{NS}v"
+TAG_F = f"{NS}f"
+TAG_T = f"{NS}t"
+TAG_R = f"{NS}r"
+TAG_IS = f"{NS}is"
+TAG_SI = f"{NS}si"
+TAG_MERGE = f"{NS}mergeCell"
+TAG_HYPERLINK = f"{NS}hyperlink"
+TAG_DIMENSION = f"{NS}dimension"
+TAG_SHEET_DATA = f"{NS}sheetData"
+
+
+def _texto_rico(elemento):
+    """Texto de um <si>/<is>: <t> direto mais os <t> dos runs (ignora fonética)"""
+    partes = []
+    for filho in elemento:
+        if filho.tag == TAG_T:
+            partes.append(filho.text or "")
+        elif filho.tag == TAG_R:
+            t = filho.find(TAG_T)
+            if t is not None:
+                partes.append(t.text or "")
+    return "".join(partes)
+
+
+def _caminho_parte(base, alvo):
+    """Resolve o Target de um relacionamento relativo à parte de origem"""
+    if alvo.startswith("/"):
+        return alvo.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base), alvo))
+
+
+def _relacionamentos(pacote, parte):
+    """Lê o .rels de uma parte: {Id: caminho da parte alvo}"""
+    caminho = posixpath.join(posixpath.dirname(parte), "_rels", posixpath.basename(parte) + ".rels")
+    if caminho not in pacote.NameToInfo:
+        return {}
+    raiz = etree.fromstring(pacote.read(caminho))
+    return {
+        rel.get("Id"): _caminho_parte(parte, rel.get("Target"))
+        for rel in raiz.iter(f"{NS_PKG_REL}Relationship")
+        if rel.get("TargetMode") != "External"
+    }
+
+
+def _strings_compartilhadas(pacote, caminho):
+    if not caminho or caminho not in pacote.NameToInfo:
+        return []
+    strings = []
+    with pacote.open(caminho) as fonte:
+        for _, si in etree.iterparse(fonte, events=("end",), tag=TAG_SI):
+            strings.append(_texto_rico(si).replace("x005F_", ""))
+            si.clear()
+    return strings
+
+
+def _formatos_data(pacote, caminho):
+    """Índices de estilo (atributo s) que representam datas e durações"""
+    datas, duracoes = set(), set()
+    if not caminho or caminho not in pacote.NameToInfo:
+        return datas, duracoes
+
+    raiz = etree.fromstring(pacote.read(caminho))
+    personalizados = {
+        int(fmt.get("numFmtId")): fmt.get("formatCode")
+        for fmt in raiz.iterfind(f"{NS}numFmts/{NS}numFmt")
+    }
+    for indice, xf in enumerate(raiz.iterfind(f"{NS}cellXfs/{NS}xf")):
+        id_formato = int(xf.get("numFmtId", 0))
+        formato = personalizados.get(id_formato) or builtin_format_code(id_formato)
+        if is_date_format(formato):
+            datas.add(indice)
+        if is_timedelta_format(formato):
+            duracoes.add(indice)
+    return datas, duracoes
+
+
+# Cache de letras de coluna -> índice ("AB" -> 28)
+_COLUNAS = {}
+
+
+def _coordenada(ref):
+    """'AB12' -> (12, 28)"""
+    i = 0
+    while not ref[i].isdigit():
+        i += 1
+    letras = ref[:i]
+    coluna = _COLUNAS.get(letras)
+    if coluna is None:
+        coluna = 0
+        for letra in letras:
+            coluna = coluna * 26 + ord(letra) - 64
+        _COLUNAS[letras] = coluna
+    return int(ref[i:]), coluna
+
+
+def _fim_intervalo(ref):
+    """Última célula de um intervalo 'A1:D4' (ou da própria célula)"""
+    return _coordenada(ref.split(":")[-1].replace("$", ""))
+
+
+class LeitorXlsx:
+    """Abre o pacote .xlsx e carrega uma vez os dados compartilhados entre planilhas"""
+
+    def __init__(self, arquivo):
+        self.pacote = zipfile.ZipFile(arquivo)
+
+        raiz_rels = _relacionamentos(self.pacote, "")
+        self.parte_workbook = next(
+            (p for p in raiz_rels.values() if p.endswith("workbook.xml")), "xl/workbook.xml"
+        )
+        rels = _relacionamentos(self.pacote, self.parte_workbook)
+        workbook = etree.fromstring(self.pacote.read(self.parte_workbook))
+
+        propriedades = workbook.find(f"{NS}workbookPr")
+        date1904 = propriedades is not None and propriedades.get("date1904") in ("1", "true")
+        self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+        self.planilhas = [
+            (sheet.get("name"), rels.get(sheet.get(f"{NS_REL}id")))
+            for sheet in workbook.iterfind(f"{NS}sheets/{NS}sheet")
+        ]
+        view = workbook.find(f"{NS}bookViews/{NS}workbookView")
+        self.ativa = int(view.get("activeTab", 0)) if view is not None else 0
+
+        alvos = {posixpath.basename(p): p for p in rels.values() if p}
+        self.strings = _strings_compartilhadas(self.pacote, alvos.get("sharedStrings.xml"))
+        self.datas, self.duracoes = _formatos_data(self.pacote, alvos.get("styles.xml"))
+
+    def fechar(self):
+        self.pacote.close()
+
+    def caminho_planilha(self, sheet=None):
+        if sheet is None:
+            return self.planilhas[self.ativa][1]
+        for nome, caminho in self.planilhas:
+            if nome == sheet:
+                return caminho
+        raise KeyError(f"Worksheet {sheet} does not exist.")
+
+    def dimensao(self, sheet=None):
+        """
+        (max_linha, max_coluna) do elemento <dimension> da planilha, ou None
+        se ele não existir (ex.: arquivos gravados em modo write_only)
+
+        Só lê o começo do XML: o elemento vem antes de <sheetData>.
+        """
+        with self.pacote.open(self.caminho_planilha(sheet)) as fonte:
+            for _, elemento in etree.iterparse(fonte, events=("start",), tag=(TAG_DIMENSION, TAG_SHEET_DATA)):
+                ref = elemento.get("ref") if elemento.tag == TAG_DIMENSION else None
+                return _fim_intervalo(ref) if ref else None
+        return None
+
+    def linhas(self, sheet=None, extensao=None):
+        """
+        Gera (número da linha, tupla de valores) para cada <row> da planilha
+
+        As tuplas vão da coluna 1 até a última célula presente na linha.
+        Se extensao for uma lista [max_linha, max_coluna], ela é atualizada
+        com as células de mesclagens e hyperlinks encontradas após os dados.
+        """
+        strings = self.strings
+        datas, duracoes = self.datas, self.duracoes
+        epoch = self.epoch
+        formulas = {}
+        numero = 0
+
+        with self.pacote.open(self.caminho_planilha(sheet)) as fonte:
+            for _, elemento in etree.iterparse(fonte, events=("end",), tag=(TAG_ROW, TAG_MERGE, TAG_HYPERLINK)):
+                tag = elemento.tag
+                if tag == TAG_ROW:
+                    r = elemento.get("r")
+                    numero = int(float(r)) if r else numero + 1
+                    sufixo = len(str(numero))
+                    valores = []
+                    coluna = 0
+                    for c in elemento.iterchildren(TAG_C):
+                        ref = c.get("r")
+                        if ref:
+                            # "AB12" -> letras "AB" (o número da linha já é conhecido)
+                            coluna = _COLUNAS.get(ref[:-sufixo]) or _coordenada(ref)[1]
+                        else:
+                            coluna += 1
+                            ref = f"{get_column_letter(coluna)}{numero}"
+                        if coluna > len(valores) + 1:
+                            valores.extend([None] * (coluna - len(valores) - 1))
+
+                        # Um único passe pelos filhos (find() do lxml é caro por célula)
+                        valor = formula = inline = None
+                        for filho in c:
+                            tag_filho = filho.tag
+                            if tag_filho == TAG_V:
+                                valor = filho.text or None
+                            elif tag_filho == TAG_F:
+                                formula = filho
+                            elif tag_filho == TAG_IS:
+                                inline = filho
+
+                        tipo = c.get("t", "n")
+                        if formula is not None:
+                            valor = _formula(formula, ref, formulas)
+                        elif tipo == "inlineStr":
+                            valor = _texto_rico(inline) if inline is not None else None
+                        elif valor is not None:
+                            if tipo == "n":
+                                valor = float(valor) if ("." in valor or "E" in valor or "e" in valor) else int(valor)
+                                estilo = c.get("s")
+                                if estilo and int(estilo) in datas:
+                                    try:
+                                        valor = from_excel(valor, epoch, timedelta=int(estilo) in duracoes)
+                                    except (OverflowError, ValueError):
+                                        valor = "#VALUE!"
+                            elif tipo == "s":
+                                valor = strings[int(valor)]
+                            elif tipo == "b":
+                                valor = bool(int(valor))
+                            elif tipo == "d":
+                                valor = from_ISO8601(valor)
+                            # "str" e "e" (erros) ficam como texto
+                        valores.append(valor)
+                    yield numero, tuple(valores)
+
+                    elemento.clear()
+                    while elemento.getprevious() is not None:
+                        del elemento.getparent()[0]
+
+                elif extensao is not None:
+                    ref = elemento.get("ref")
+                    if ref and (tag == TAG_HYPERLINK or ":" in ref):
+                        linha, coluna = _fim_intervalo(ref)
+                        extensao[0] = max(extensao[0], linha)
+                        extensao[1] = max(extensao[1], coluna)
+
+
+def _formula(f, ref, formulas):
+    """Mesma representação de fórmulas do openpyxl (data_only=False)"""
+    valor = "=" + (f.text or "")
+    tipo = f.get("t")
+    if tipo == "array":
+        return ArrayFormula(ref=f.get("ref"), text=valor)
+    if tipo == "shared":
+        indice = f.get("si")
+        if indice in formulas:
+            return formulas[indice].translate_formula(ref)
+        if valor != "=":
+            formulas[indice] = Translator(valor, ref)
+        return valor
+    if tipo == "dataTable":
+        return DataTableFormula(**f.attrib)
+    return valor
+
+
+def iter_planilha(leitor, sheet=None, extensao=None):
+    """
+    Gera as linhas da planilha como listas, incluindo as linhas vazias
+
+    As listas não são completadas até a última coluna; ao final, extensao
+    (lista [max_linha, max_coluna]) tem o tamanho que a tabela deve ter.
+    """
+    extensao = extensao if extensao is not None else [0, 0]
+    atual = 0
+    for numero, valores in leitor.linhas(sheet, extensao):
+        if not valores:
+            continue
+        while atual < numero - 1:
+            yield []
+            atual += 1
+        yield list(valores)
+        atual = numero
+        extensao[1] = max(extensao[1], len(valores))
+
+    # Mesclagens e hyperlinks podem ir além da última linha com valores
+    while atual < extensao[0]:
+        yield []
+        atual += 1
+    extensao[0] = max(extensao[0], atual)
+
+
+def ler_planilha(leitor, sheet=None):
+    """
+    Lê uma planilha de um LeitorXlsx já aberto como ler_excel: lista de listas
+    retangular, da linha 1 até a última e da coluna 1 até a última célula existente
+    """
+    extensao = [0, 0]
+    linhas = list(iter_planilha(leitor, sheet, extensao))
+
+    # Planilha sem células: o openpyxl também devolve lista vazia
+    if not linhas:
+        return []
+    max_coluna = max(extensao[1], 1)
+    for linha in linhas:
+        if len(linha) < max_coluna:
+            linha.extend([None] * (max_coluna - len(linha)))
+    return linhas
+
+
+def ler_xlsx(arquivo, sheet=None, compacto=False):
+    """
+    Lê a planilha inteira (ver ler_planilha)
+
+    Com compacto=True as linhas vão direto para uma TabelaColunar, sem
+    montar a lista de listas.
+    """
+    leitor = LeitorXlsx(arquivo)
+    try:
+        if not compacto:
+            return ler_planilha(leitor, sheet)
+
+        extensao = [0, 0]
+        tabela = TabelaColunar.de_linhas(iter_planilha(leitor, sheet, extensao))
+        if len(tabela):
+            tabela.completar_colunas(max(extensao[1], 1))
+        return tabela
+    finally:
+        leitor.fechar()
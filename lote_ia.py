@@ -0,0 +1,228 @@
+import json
+import threading
+import time
+from concurrent.futures import Future
+from resumo_word import resumo_valido
+
+# Agrupamento de perguntas pequenas em uma única chamada à IA.
+#
+# Com o rate limit de perguntar_ia, cada chamada custa o mesmo intervalo
+# independente do tamanho. Empacotar N perguntas curtas em um prompt com
+# espaços numerados multiplica a vazão por N sem usar mais cota.
+
+PROMPT_LOTE = """Responda cada pergunta abaixo de forma independente e objetiva.
+
+Retorne APENAS um JSON válido (sem markdown, sem explicações) no formato:
+{{"1": "resposta da pergunta 1", "2": "resposta da pergunta 2"}}
+com exatamente uma chave para cada número: {numeros}.
+{contexto}
+{perguntas}"""
+
+MAX_ITENS = 20
+MAX_CARACTERES = 20000
+MAX_TENTATIVAS = 3
+
+
+def _extrair_json(resposta):
+    """Pega o objeto JSON da resposta, mesmo cercado de markdown ou texto"""
+    inicio = resposta.find("{")
+    fim = resposta.rfind("}")
+    if inicio < 0 or fim < inicio:
+        return {}
+    try:
+        dados = json.loads(resposta[inicio:fim + 1])
+    except json.JSONDecodeError:
+        return {}
+    return dados if isinstance(dados, dict) else {}
+
+
+def montar_prompt(perguntas, contexto=None):
+    """Prompt com as perguntas em espaços numerados [1], [2], ..."""
+    numeros = ", ".join(str(i) for i in range(1, len(perguntas) + 1))
+    linhas = "\n".join(f"[{i}] {pergunta}" for i, pergunta in enumerate(perguntas, 1))
+    contexto = f"\nContexto: {contexto}\n" if contexto else ""
+    return PROMPT_LOTE.format(numeros=numeros, contexto=contexto, perguntas=linhas)
+
+
+def responder_lote(perguntar, perguntas, contexto=None):
+    """
+    Faz uma chamada para várias perguntas e separa as respostas
+
+    Returns:
+        Lista com a resposta de cada pergunta, ou None nos espaços que vieram
+        faltando ou malformados
+
+    Raises:
+        RuntimeError: com o texto do erro, se perguntar devolveu uma falha
+    """
+    resposta = perguntar(montar_prompt(perguntas, contexto))
+    # Falha da chamada (API Key, cota, rede): repetir não adianta
+    if resposta and not resumo_valido(resposta):
+        raise RuntimeError(resposta)
+    dados = _extrair_json(resposta)
+
+    respostas = []
+    for i in range(1, len(perguntas) + 1):
+        valor = dados.get(str(i))
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            valor = str(valor)
+        respostas.append(valor.strip() if isinstance(valor, str) and valor.strip() else None)
+    return respostas
+
+
+def _dividir(indices, perguntas, max_itens, max_caracteres):
+    """Agrupa os índices em lotes limitados por quantidade e por tamanho"""
+    lote, tamanho = [], 0
+    for i in indices:
+        if lote and (len(lote) >= max_itens or tamanho + len(perguntas[i]) > max_caracteres):
+            yield lote
+            lote, tamanho = [], 0
+        lote.append(i)
+        tamanho += len(perguntas[i])
+    if lote:
+        yield lote
+
+
+def perguntar_em_lote(perguntar, perguntas, contexto=None, max_itens=MAX_ITENS,
+                      max_caracteres=MAX_CARACTERES, max_tentativas=MAX_TENTATIVAS):
+    """
+    Responde uma lista de perguntas usando o mínimo de chamadas
+
+    Os itens que voltarem faltando ou malformados são perguntados de novo
+    (só eles) em lotes seguintes, até max_tentativas. Se a chamada falhar
+    (perguntar devolve um erro), as perguntas sem resposta recebem esse erro.
+
+    Returns:
+        Lista de respostas na mesma ordem das perguntas
+    """
+    respostas = [None] * len(perguntas)
+    pendentes = list(range(len(perguntas)))
+
+    for _ in range(max_tentativas):
+        if not pendentes:
+            break
+        faltando = []
+        for lote in _dividir(pendentes, perguntas, max_itens, max_caracteres):
+            try:
+                parciais = responder_lote(perguntar, [perguntas[i] for i in lote], contexto)
+            except RuntimeError as e:
+                # As perguntas ainda sem resposta recebem o erro real da chamada
+                return [str(e) if resposta is None else resposta for resposta in respostas]
+            for i, resposta in zip(lote, parciais):
+                if resposta is None:
+                    faltando.append(i)
+                else:
+                    respostas[i] = resposta
+        pendentes = faltando
+
+    for i in pendentes:
+        respostas[i] = "❌ Erro: a IA não retornou resposta para esta pergunta"
+    return respostas
+
+
+class AgrupadorPerguntas:
+    """
+    Junta perguntas enviadas por várias threads em chamadas únicas
+
+    Cada pergunta espera no máximo `janela` segundos por companhia; o lote
+    sai antes se atingir max_itens ou max_caracteres. Use como context
+    manager para garantir que as perguntas pendentes sejam enviadas.
+    """
+
+    def __init__(self, perguntar, janela=0.5, contexto=None, max_itens=MAX_ITENS,
+                 max_caracteres=MAX_CARACTERES, max_tentativas=MAX_TENTATIVAS):
+        self._perguntar = perguntar
+        self.janela = janela
+        self.contexto = contexto
+        self.max_itens = max_itens
+        self.max_caracteres = max_caracteres
+        self.max_tentativas = max_tentativas
+
+        self._pendentes = []  # (pergunta, future, tentativas, chegada)
+        self._condicao = threading.Condition()
+        self._fechado = False
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def enviar(self, pergunta):
+        """Coloca a pergunta na fila e retorna um Future com a resposta"""
+        future = Future()
+        with self._condicao:
+            if self._fechado:
+                raise RuntimeError("Agrupador já foi fechado")
+            self._pendentes.append((pergunta, future, 0, time.monotonic()))
+            self._condicao.notify()
+        return future
+
+    def perguntar(self, pergunta):
+        """Como perguntar_ia, mas a pergunta pode sair junto com outras"""
+        return self.enviar(pergunta).result()
+
+    def fechar(self):
+        """Envia o que estiver pendente e encerra a thread de envio"""
+        with self._condicao:
+            self._fechado = True
+            self._condicao.notify()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _proximo_lote(self):
+        """Espera a janela ou o limite de tamanho e retira um lote da fila"""
+        with self._condicao:
+            while True:
+                if self._pendentes:
+                    tamanho = sum(len(p[0]) for p in self._pendentes)
+                    espera = self._pendentes[0][3] + self.janela - time.monotonic()
+                    cheio = len(self._pendentes) >= self.max_itens or tamanho >= self.max_caracteres
+                    if cheio or espera <= 0 or self._fechado:
+                        break
+                    self._condicao.wait(espera)
+                elif self._fechado:
+                    return []
+                else:
+                    self._condicao.wait()
+
+            lote, tamanho = [], 0
+            while self._pendentes and len(lote) < self.max_itens:
+                tamanho_item = len(self._pendentes[0][0])
+                if lote and tamanho + tamanho_item > self.max_caracteres:
+                    break
+                lote.append(self._pendentes.pop(0))
+                tamanho += tamanho_item
+            return lote
+
+    def _executar(self):
+        while True:
+            lote = self._proximo_lote()
+            if not lote:
+                return
+            try:
+                respostas = responder_lote(self._perguntar, [item[0] for item in lote], self.contexto)
+            except RuntimeError as e:
+                # Falha da chamada: o erro vai como resposta, como em perguntar_ia
+                for _, future, _, _ in lote:
+                    future.set_result(str(e))
+                continue
+            except Exception as e:
+                for _, future, _, _ in lote:
+                    future.set_exception(e)
+                continue
+
+            refazer = []
+            for (pergunta, future, tentativas, chegada), resposta in zip(lote, respostas):
+                if resposta is not None:
+                    future.set_result(resposta)
+                elif tentativas + 1 >= self.max_tentativas:
+                    future.set_result("❌ Erro: a IA não retornou resposta para esta pergunta")
+                else:
+                    refazer.append((pergunta, future, tentativas + 1, chegada))
+
+            # Itens faltando ou malformados voltam para a frente da fila
+            if refazer:
+                with self._condicao:
+                    self._pendentes[:0] = refazer
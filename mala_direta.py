@@ -0,0 +1,192 @@
+import io
+import os
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from xml.sax.saxutils import unescape
+from docx import Document
+from tabela_word import texto_xml
+
+# Placeholder no modelo: {{Nome}} ou {{ Nome }}
+PLACEHOLDER = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+
+# Caracteres não permitidos em nomes de arquivo
+_NOME_INVALIDO = re.compile(r'[\\/:*?"<>|\r\n\t]+')
+
+# Entidades que podem aparecer no texto de um placeholder dentro do XML
+_ENTIDADES = {"&quot;": '"', "&apos;": "'"}
+
+# Registros enviados de uma vez a um worker, e lotes em andamento por worker
+# (limita quantos documentos ficam em memória esperando para serem gravados)
+TAMANHO_LOTE = 16
+LOTES_POR_WORKER = 2
+
+# Modelo já preparado, carregado uma vez por processo worker
+_modelo_worker = None
+
+
+def _paragrafos(container):
+    """Percorre os parágrafos de um container, incluindo os de tabelas aninhadas"""
+    yield from container.paragraphs
+    for tabela in container.tables:
+        for linha in tabela.rows:
+            for celula in linha.cells:
+                yield from _paragrafos(celula)
+
+
+def _unificar_runs(paragrafo):
+    """
+    O Word costuma quebrar "{{Nome}}" em vários runs. Quando isso acontece,
+    junta o texto do parágrafo no primeiro run para que a substituição possa
+    ser feita direto no XML.
+    """
+    total = len(PLACEHOLDER.findall(paragrafo.text))
+    if not total:
+        return
+
+    runs = paragrafo.runs
+    if sum(len(PLACEHOLDER.findall(run.text)) for run in runs) == total:
+        return
+
+    runs[0].text = "".join(run.text for run in runs)
+    for run in runs[1:]:
+        run._r.getparent().remove(run._r)
+
+
+def preparar_modelo(arquivo_modelo):
+    """
+    Lê o modelo .docx uma única vez e o deixa pronto para renderização
+
+    Returns:
+        Lista de (nome da parte, conteúdo) do pacote. Partes com placeholders
+        ficam como str (para substituição), as demais como bytes.
+    """
+    doc = Document(arquivo_modelo)
+
+    containers = [doc]
+    for secao in doc.sections:
+        for parte in (secao.header, secao.footer, secao.first_page_header,
+                      secao.first_page_footer, secao.even_page_header, secao.even_page_footer):
+            # Só cabeçalhos/rodapés definidos: acessar os vinculados criaria partes novas
+            if not parte.is_linked_to_previous:
+                containers.append(parte)
+
+    for container in containers:
+        for paragrafo in _paragrafos(container):
+            _unificar_runs(paragrafo)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+
+    partes = []
+    with zipfile.ZipFile(buffer) as pacote:
+        for nome in pacote.namelist():
+            conteudo = pacote.read(nome)
+            if nome.endswith(".xml") and b"{{" in conteudo:
+                conteudo = conteudo.decode("utf-8")
+            partes.append((nome, conteudo))
+    return partes
+
+
+def renderizar(partes, registro):
+    """
+    Gera os bytes de um .docx substituindo os placeholders pelos valores do registro
+
+    Placeholders sem coluna correspondente são mantidos como estão.
+    """
+    def substituir(match):
+        # No XML o nome vem escapado: {{P&D}} aparece como {{P&amp;D}}
+        campo = unescape(match.group(1), _ENTIDADES)
+        if campo not in registro:
+            return match.group(0)
+        return texto_xml(registro[campo])
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as pacote:
+        for nome, conteudo in partes:
+            if isinstance(conteudo, str):
+                conteudo = PLACEHOLDER.sub(substituir, conteudo).encode("utf-8")
+            pacote.writestr(nome, conteudo)
+    return buffer.getvalue()
+
+
+def nome_documento(padrao, indice, registro):
+    """Monta o nome do arquivo a partir do padrão ({n} e {{Campo}} são substituídos)"""
+    nome = PLACEHOLDER.sub(lambda m: str(registro.get(m.group(1), "") or ""), padrao)
+    nome = nome.replace("{n}", str(indice))
+    return _NOME_INVALIDO.sub("_", nome).strip() or f"documento_{indice}.docx"
+
+
+def _iniciar_worker(arquivo_modelo):
+    global _modelo_worker
+    _modelo_worker = preparar_modelo(arquivo_modelo)
+
+
+def _renderizar_worker(lote):
+    return [
+        (nome_documento(padrao, indice, registro), renderizar(_modelo_worker, registro))
+        for indice, registro, padrao in lote
+    ]
+
+
+def gerar_documentos(arquivo_modelo, registros, saida, padrao_nome="documento_{n}.docx", max_workers=None):
+    """
+    Gera um .docx por registro em paralelo
+
+    Args:
+        arquivo_modelo: modelo .docx com placeholders {{Campo}}
+        registros: iterável de dicionários {campo: valor}
+        saida: pasta de destino, ou arquivo .zip para gravar tudo em um único pacote
+        padrao_nome: nome de cada documento ({n} = número da linha, {{Campo}} = valor)
+        max_workers: número de processos (padrão: número de CPUs)
+
+    Returns:
+        Lista com os nomes dos documentos gerados
+    """
+    tarefas = ((i, registro, padrao_nome) for i, registro in enumerate(registros, 1))
+
+    if saida.lower().endswith(".zip"):
+        # Os .docx já são comprimidos: grava sem recomprimir
+        destino = zipfile.ZipFile(saida, "w", zipfile.ZIP_STORED)
+        gravar = destino.writestr
+    else:
+        os.makedirs(saida, exist_ok=True)
+        destino = None
+
+        def gravar(nome, conteudo):
+            with open(os.path.join(saida, nome), "wb") as f:
+                f.write(conteudo)
+
+    gerados = []
+    usados = set()
+
+    def gravar_lote(documentos):
+        for nome, conteudo in documentos:
+            # Evita sobrescrever quando o padrão gera nomes repetidos
+            if nome in usados:
+                nome = f"{len(gerados) + 1}_{nome}"
+            gravar(nome, conteudo)
+            usados.add(nome)
+            gerados.append(nome)
+
+    # Os registros são enviados aos poucos (janela de lotes), na ordem: os
+    # registros vêm em streaming e só os lotes em andamento ficam em memória
+    max_workers = max_workers or os.cpu_count() or 1
+    lotes = iter(lambda: list(islice(tarefas, TAMANHO_LOTE)), [])
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_iniciar_worker,
+                                 initargs=(arquivo_modelo,)) as executor:
+            pendentes = deque()
+            for lote in lotes:
+                pendentes.append(executor.submit(_renderizar_worker, lote))
+                if len(pendentes) >= max_workers * LOTES_POR_WORKER:
+                    gravar_lote(pendentes.popleft().result())
+            while pendentes:
+                gravar_lote(pendentes.popleft().result())
+    finally:
+        if destino is not None:
+            destino.close()
+
+    return gerados
@@ -0,0 +1,329 @@
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import zipfile
+
+# watchdog é opcional: usa inotify no Linux (e equivalentes no Windows/Mac).
+# Sem ele, as pastas são varridas periodicamente (polling).
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+EXTENSOES = ('.xlsx', '.csv', '.parquet')
+
+
+def _eh_planilha(caminho):
+    nome = os.path.basename(caminho)
+    # Arquivos temporários/de trava do Excel e do LibreOffice
+    if nome.startswith(('~$', '.~lock', '.')):
+        return False
+    return nome.lower().endswith(EXTENSOES)
+
+
+def _assinatura(caminho):
+    try:
+        info = os.stat(caminho)
+    except OSError:
+        return None
+    return info.st_size, info.st_mtime_ns
+
+
+# Os nomes de saída mantêm a extensão da planilha: v.xlsx e v.csv na mesma
+# pasta não podem gravar o mesmo relatório nem o mesmo estado
+def _nome_relatorio(caminho):
+    return caminho + '_relatorio.docx'
+
+
+def _nome_estado(caminho):
+    return caminho + '_incremental.json'
+
+
+class _Eventos(FileSystemEventHandler):
+    """Repassa criações, alterações e renomeações de arquivos para o monitor"""
+
+    def __init__(self, monitor):
+        self.monitor = monitor
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.monitor.observar(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.monitor.observar(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.monitor.observar(event.dest_path)
+
+
+class MonitorPasta:
+    """
+    Daemon que gera o relatório Word (vendas.xlsx -> vendas.xlsx_relatorio.docx)
+    de cada planilha nova ou alterada
+
+    Um arquivo só entra na fila depois de ficar `estabilidade` segundos sem
+    mudar de tamanho/data (e, no caso do .xlsx, de ser um zip completo), para
+    não processar arquivos ainda sendo copiados ou salvos.
+    """
+
+    def __init__(self, agente, pastas, max_workers=2, estabilidade=2.0, intervalo=2.0,
+                 incremental=True, usar_watchdog=True):
+        """
+        Args:
+            agente: AgenteOfficeIA usado para gerar os relatórios
+            pastas: pasta ou lista de pastas monitoradas
+            max_workers: número de relatórios gerados ao mesmo tempo
+            estabilidade: segundos sem alteração para considerar o arquivo pronto
+            intervalo: segundos entre varreduras no modo polling
+            incremental: reaproveita a análise dos blocos que não mudaram
+            usar_watchdog: usa eventos do sistema (inotify) se o watchdog estiver instalado
+        """
+        self.agente = agente
+        self.pastas = [pastas] if isinstance(pastas, str) else list(pastas)
+        self.max_workers = max_workers
+        self.estabilidade = estabilidade
+        self.intervalo = intervalo
+        self.incremental = incremental
+        self.usar_watchdog = usar_watchdog and Observer is not None
+
+        self._fila = queue.Queue()
+        self._lock = threading.Lock()
+        self._parar = threading.Event()     # pedido de parada (parar() ou sinal)
+        self._encerrado = False             # parar() já rodou
+        self._thread_ciclo = None
+        self._candidatos = {}   # caminho -> (assinatura, momento da última mudança)
+        self._vistos = {}       # caminho -> última assinatura observada (polling)
+        self._processados = {}  # caminho -> assinatura do último relatório gerado
+        self._em_fila = set()
+        self._workers = []
+        self._observer = None
+
+        # Contadores
+        self._inicio = None
+        self._concluidos = 0
+        self._falhas = 0
+        self._em_andamento = 0
+        self._latencia_total = 0.0
+        self._latencia_max = 0.0
+
+    # ============ DETECÇÃO ============
+
+    def observar(self, caminho):
+        """Registra que o arquivo mudou; ele entra na fila quando estabilizar"""
+        if not _eh_planilha(caminho):
+            return
+        assinatura = _assinatura(caminho)
+        if assinatura is None:
+            return
+        with self._lock:
+            anterior = self._candidatos.get(caminho)
+            if anterior is None or anterior[0] != assinatura:
+                self._candidatos[caminho] = (assinatura, time.monotonic())
+
+    def _varrer(self):
+        """Modo polling: compara tamanho/data de cada arquivo com a última varredura"""
+        for pasta in self.pastas:
+            try:
+                entradas = list(os.scandir(pasta))
+            except OSError:
+                continue
+            for entrada in entradas:
+                if entrada.is_file() and _eh_planilha(entrada.path):
+                    assinatura = _assinatura(entrada.path)
+                    if assinatura != self._vistos.get(entrada.path):
+                        self._vistos[entrada.path] = assinatura
+                        self.observar(entrada.path)
+
+    def _pronto(self, caminho):
+        """Um .xlsx pela metade não tem o diretório central do zip"""
+        if caminho.lower().endswith('.xlsx'):
+            return zipfile.is_zipfile(caminho)
+        return True
+
+    def _enfileirar_estaveis(self):
+        agora = time.monotonic()
+        with self._lock:
+            candidatos = list(self._candidatos.items())
+
+        for caminho, (assinatura, momento) in candidatos:
+            if agora - momento < self.estabilidade:
+                continue
+
+            atual = _assinatura(caminho)
+            with self._lock:
+                if atual != assinatura:
+                    # Mudou de novo (ou sumiu): reinicia a espera
+                    if atual is None:
+                        self._candidatos.pop(caminho, None)
+                    else:
+                        self._candidatos[caminho] = (atual, agora)
+                    continue
+                if not self._pronto(caminho):
+                    self._candidatos[caminho] = (atual, agora)
+                    continue
+
+                del self._candidatos[caminho]
+                if self._processados.get(caminho) == atual or caminho in self._em_fila:
+                    continue
+                self._em_fila.add(caminho)
+
+            # Latência contada a partir da última alteração do arquivo
+            self._fila.put((caminho, atual, momento))
+
+    def _pendentes_iniciais(self):
+        """Na partida, entram na fila as planilhas sem relatório ou com relatório antigo"""
+        for pasta in self.pastas:
+            try:
+                entradas = list(os.scandir(pasta))
+            except OSError:
+                continue
+            for entrada in entradas:
+                if not (entrada.is_file() and _eh_planilha(entrada.path)):
+                    continue
+                relatorio = _nome_relatorio(entrada.path)
+                if os.path.exists(relatorio) and os.path.getmtime(relatorio) >= entrada.stat().st_mtime:
+                    self._processados[entrada.path] = _assinatura(entrada.path)
+                else:
+                    self.observar(entrada.path)
+                self._vistos[entrada.path] = _assinatura(entrada.path)
+
+    # ============ PROCESSAMENTO ============
+
+    def _trabalhar(self):
+        while True:
+            item = self._fila.get()
+            if item is None:
+                self._fila.task_done()
+                return
+
+            caminho, assinatura, detectado = item
+            with self._lock:
+                self._em_andamento += 1
+            try:
+                self.agente.relatorio_de_excel(caminho, incremental=self.incremental,
+                                               arquivo_saida=_nome_relatorio(caminho),
+                                               arquivo_estado=_nome_estado(caminho))
+                sucesso = True
+            except Exception as e:
+                print(f"❌ Erro ao gerar relatório de {caminho}: {e}")
+                sucesso = False
+
+            latencia = time.monotonic() - detectado
+            with self._lock:
+                self._em_andamento -= 1
+                self._em_fila.discard(caminho)
+                if sucesso:
+                    self._processados[caminho] = assinatura
+                    self._concluidos += 1
+                    self._latencia_total += latencia
+                    self._latencia_max = max(self._latencia_max, latencia)
+                else:
+                    self._falhas += 1
+            if sucesso:
+                print(f"📄 Relatório pronto: {_nome_relatorio(caminho)} ({latencia:.1f}s)")
+            self._fila.task_done()
+
+    def estatisticas(self):
+        """Latência, profundidade da fila e vazão desde o início"""
+        with self._lock:
+            decorrido = time.monotonic() - self._inicio if self._inicio else 0.0
+            return {
+                "concluidos": self._concluidos,
+                "falhas": self._falhas,
+                "em_andamento": self._em_andamento,
+                "na_fila": self._fila.qsize(),
+                "aguardando_estabilizar": len(self._candidatos),
+                "latencia_media": self._latencia_total / self._concluidos if self._concluidos else 0.0,
+                "latencia_max": self._latencia_max,
+                "por_minuto": self._concluidos / decorrido * 60 if decorrido else 0.0,
+            }
+
+    # ============ CICLO DE VIDA ============
+
+    def iniciar(self):
+        """Inicia a observação das pastas e os workers (não bloqueia)"""
+        self._inicio = time.monotonic()
+        self._pendentes_iniciais()
+
+        for _ in range(self.max_workers):
+            worker = threading.Thread(target=self._trabalhar, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        if self.usar_watchdog:
+            self._observer = Observer()
+            eventos = _Eventos(self)
+            for pasta in self.pastas:
+                self._observer.schedule(eventos, pasta, recursive=False)
+            self._observer.start()
+
+        self._thread_ciclo = threading.Thread(target=self._ciclo, daemon=True)
+        self._thread_ciclo.start()
+        modo = "eventos do sistema" if self.usar_watchdog else f"polling a cada {self.intervalo}s"
+        print(f"👀 Monitorando {', '.join(self.pastas)} ({modo})")
+
+    def _ciclo(self):
+        proxima_varredura = 0.0
+        while not self._parar.is_set():
+            if not self.usar_watchdog and time.monotonic() >= proxima_varredura:
+                self._varrer()
+                proxima_varredura = time.monotonic() + self.intervalo
+            self._enfileirar_estaveis()
+            self._parar.wait(min(0.5, self.estabilidade))
+
+    def parar(self):
+        """Para de observar e espera terminar o que já está na fila e em andamento"""
+        with self._lock:
+            if self._encerrado:
+                return
+            self._encerrado = True
+
+        self._parar.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        # O ciclo precisa terminar antes dos sentinelas: um item enfileirado
+        # depois deles não teria mais worker para processá-lo
+        if self._thread_ciclo is not None:
+            self._thread_ciclo.join()
+
+        for _ in self._workers:
+            self._fila.put(None)
+        for worker in self._workers:
+            worker.join()
+
+        e = self.estatisticas()
+        print(f"🛑 Monitor encerrado: {e['concluidos']} relatórios, {e['falhas']} falhas, "
+              f"latência média {e['latencia_media']:.1f}s")
+
+    def executar(self, intervalo_status=60):
+        """Roda até Ctrl+C/SIGTERM, mostrando as estatísticas periodicamente"""
+        def encerrar(*_):
+            self._parar.set()
+
+        signal.signal(signal.SIGINT, encerrar)
+        if hasattr(signal, "SIGTERM"):
+            signal.signal(signal.SIGTERM, encerrar)
+
+        self.iniciar()
+        try:
+            while not self._parar.wait(intervalo_status):
+                e = self.estatisticas()
+                print(f"📊 {e['concluidos']} prontos | fila {e['na_fila']} | em andamento {e['em_andamento']} | "
+                      f"latência média {e['latencia_media']:.1f}s | {e['por_minuto']:.1f}/min")
+        finally:
+            self.parar()
+
+
+if __name__ == "__main__":
+    # Uso: python monitor_pasta.py [pasta ...]
+    from agent import AgenteOfficeIA
+
+    MonitorPasta(AgenteOfficeIA(), sys.argv[1:] or ["."]).executar()
@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import openpyxl
+from excel_colunar import escrever_planilha
+from leitor_xlsx import LeitorXlsx, iter_planilha, ler_planilha
+
+# Pastas de trabalho com várias planilhas.
+#
+# A leitura de cada planilha é independente (o XML de cada uma é uma parte
+# separada do zip), então as planilhas são lidas em processos separados. Cada
+# worker abre o arquivo uma vez e reaproveita strings compartilhadas e estilos
+# para todas as planilhas que receber.
+
+# Pasta de trabalho aberta uma vez por processo worker
+_arquivo_worker = None
+
+
+def nomes_planilhas(arquivo):
+    """Nomes das planilhas na ordem da pasta de trabalho (sem carregar as células)"""
+    leitor = LeitorXlsx(arquivo)
+    try:
+        return [nome for nome, _ in leitor.planilhas]
+    finally:
+        leitor.fechar()
+
+
+def _abrir(arquivo, engine):
+    """Abre o arquivo uma vez: (leitor, função de fechamento)"""
+    # As duas engines leem pelo leitor fast: o modo read_only do openpyxl não
+    # converte durações e carregar a pasta inteira em cada worker tiraria o
+    # ganho do paralelismo. O resultado é o mesmo de ler_excel
+    if engine not in ("openpyxl", "fast"):
+        raise ValueError(f"Engine desconhecida: {engine} (use 'openpyxl' ou 'fast')")
+    leitor = LeitorXlsx(arquivo)
+    return leitor, leitor.fechar
+
+
+def _iniciar_worker(arquivo, engine):
+    global _arquivo_worker
+    _arquivo_worker = _abrir(arquivo, engine)
+
+
+def _ler_worker(sheet):
+    leitor, _ = _arquivo_worker
+    return sheet, ler_planilha(leitor, sheet)
+
+
+def ler_planilhas(arquivo, sheets=None, engine="openpyxl", max_workers=None):
+    """
+    Lê várias planilhas de um .xlsx em paralelo
+
+    Args:
+        arquivo: nome do arquivo .xlsx
+        sheets: nomes das planilhas (padrão: todas)
+        engine: "openpyxl" ou "fast" (ver ler_excel); as duas dão o mesmo resultado
+        max_workers: número de processos (padrão: número de CPUs)
+
+    Returns:
+        Dicionário {nome da planilha: lista de listas}, na ordem pedida
+    """
+    nomes = nomes_planilhas(arquivo)
+    if sheets is None:
+        sheets = nomes
+    else:
+        sheets = list(sheets)
+        for sheet in sheets:
+            if sheet not in nomes:
+                raise KeyError(f"Worksheet {sheet} does not exist.")
+
+    # Uma planilha só (ou um processo só): não compensa subir workers
+    max_workers = min(max_workers or os.cpu_count() or 1, len(sheets))
+    if max_workers <= 1:
+        leitor, fechar = _abrir(arquivo, engine)
+        try:
+            return {sheet: ler_planilha(leitor, sheet) for sheet in sheets}
+        finally:
+            fechar()
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_iniciar_worker,
+                             initargs=(arquivo, engine)) as executor:
+        return dict(executor.map(_ler_worker, sheets))
+
+
+def amostras_planilhas(arquivo, sheets=None, linhas=10):
+    """
+    Primeiras linhas de cada planilha, abrindo o arquivo uma única vez
+
+    Returns:
+        Dicionário {nome da planilha: lista de listas}
+    """
+    leitor = LeitorXlsx(arquivo)
+    try:
+        if sheets is None:
+            sheets = [nome for nome, _ in leitor.planilhas]
+        return {sheet: list(islice(iter_planilha(leitor, sheet), linhas)) for sheet in sheets}
+    finally:
+        leitor.fechar()
+
+
+def escrever_planilhas(arquivo, planilhas, cabecalhos=None):
+    """
+    Cria um .xlsx com várias planilhas em uma única passada (modo write_only)
+
+    Args:
+        arquivo: nome do arquivo .xlsx
+        planilhas: dicionário {nome da planilha: dados}; os dados podem ser
+                   lista de listas, array NumPy, DataFrame pandas ou Table Arrow
+        cabecalhos: dicionário {nome da planilha: lista de cabeçalhos} (opcional)
+    """
+    cabecalhos = cabecalhos or {}
+    wb = openpyxl.Workbook(write_only=True)
+    for nome, dados in planilhas.items():
+        escrever_planilha(wb.create_sheet(title=nome), dados, cabecalhos.get(nome))
+    wb.save(arquivo)
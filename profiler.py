@@ -0,0 +1,209 @@
+import cProfile
+import inspect
+import io
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+# Variáveis de ambiente que ativam o profiling sem mudar código
+ENV_ATIVAR = "AGENTE_PROFILING"
+ENV_PASTA = "AGENTE_PROFILING_DIR"
+
+_contador = itertools.count(1)
+_local = threading.local()
+
+# tracemalloc é global ao processo: sessões simultâneas (várias threads)
+# compartilham o rastreamento, que só para quando a última termina
+_lock_sessoes = threading.Lock()
+_sessoes_ativas = 0
+_tracemalloc_nosso = False
+
+# A partir do Python 3.12 o cProfile usa sys.monitoring: só um pode estar
+# ligado por processo (e ele vê todas as threads). As chamadas que começam
+# enquanto outra está sendo perfilada ficam só com tempo e memória
+_CPROFILE_UNICO = sys.version_info >= (3, 12)
+_cprofile_ocupado = False
+
+# Marca o fim de um gerador perfilado
+_FIM = object()
+
+
+def profiling_ativado():
+    """Indica se o profiling foi ativado pela variável de ambiente"""
+    return os.environ.get(ENV_ATIVAR, "").strip().lower() in ("1", "true", "sim", "yes", "on")
+
+
+def _relatorio(nome, perfil, snapshot, pico, duracao, top=25):
+    """Monta o texto com as funções mais custosas e as maiores alocações"""
+    saida = io.StringIO()
+    saida.write(f"{nome}: {duracao:.3f}s, pico de memória {pico / 1024 / 1024:.1f} MB\n\n")
+
+    if perfil is not None:
+        saida.write(f"=== Top {top} funções (tempo acumulado) ===\n")
+        pstats.Stats(perfil, stream=saida).sort_stats("cumulative").print_stats(top)
+
+    saida.write(f"\n=== Top {top} alocações (por linha) ===\n")
+    for estatistica in snapshot.statistics("lineno")[:top]:
+        saida.write(f"{estatistica}\n")
+    return saida.getvalue()
+
+
+def _iniciar_tracemalloc():
+    global _sessoes_ativas, _tracemalloc_nosso
+    with _lock_sessoes:
+        if _sessoes_ativas == 0:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _tracemalloc_nosso = True
+            # Com sessões simultâneas o pico é o do conjunto desde a primeira
+            tracemalloc.reset_peak()
+        _sessoes_ativas += 1
+
+
+def _reservar_cprofile():
+    """True se esta sessão pode ligar o cProfile agora"""
+    global _cprofile_ocupado
+    if not _CPROFILE_UNICO:
+        return True
+    with _lock_sessoes:
+        if _cprofile_ocupado:
+            return False
+        _cprofile_ocupado = True
+        return True
+
+
+def _liberar_cprofile():
+    global _cprofile_ocupado
+    if _CPROFILE_UNICO:
+        with _lock_sessoes:
+            _cprofile_ocupado = False
+
+
+def _parar_tracemalloc():
+    """Snapshot e pico da sessão; para o tracemalloc se foi a última e fomos nós que o iniciamos"""
+    global _sessoes_ativas, _tracemalloc_nosso
+    with _lock_sessoes:
+        snapshot = tracemalloc.take_snapshot()
+        _, pico = tracemalloc.get_traced_memory()
+        _sessoes_ativas -= 1
+        if _sessoes_ativas == 0 and _tracemalloc_nosso:
+            tracemalloc.stop()
+            _tracemalloc_nosso = False
+    return snapshot, pico
+
+
+class _Sessao:
+    """
+    Perfil de uma chamada: cProfile nos trechos em que ela executa e
+    tracemalloc do início ao fim
+
+    Um gerador pausado não mantém o perfil ligado: entre um next() e outro
+    outras chamadas da mesma thread têm o próprio perfil.
+    """
+
+    def __init__(self, nome, pasta):
+        self.nome = nome
+        self.pasta = pasta
+        self.perfil = cProfile.Profile()
+        self.duracao = 0.0
+        self.trechos_com_cpu = 0
+        self.trechos_sem_cpu = 0
+        _iniciar_tracemalloc()
+
+    @contextmanager
+    def medir(self):
+        """Executa um trecho da chamada com o perfil ligado"""
+        _local.ativo = True
+        com_cpu = _reservar_cprofile()
+        if com_cpu:
+            self.trechos_com_cpu += 1
+            self.perfil.enable()
+        else:
+            self.trechos_sem_cpu += 1
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.duracao += time.perf_counter() - inicio
+            if com_cpu:
+                self.perfil.disable()
+                _liberar_cprofile()
+            _local.ativo = False
+
+    def finalizar(self):
+        """Grava o .prof e o relatório em texto"""
+        snapshot, pico = _parar_tracemalloc()
+        os.makedirs(self.pasta, exist_ok=True)
+        base = os.path.join(self.pasta, f"{self.nome}_{time.strftime('%Y%m%d_%H%M%S')}_{next(_contador)}")
+        perfil = self.perfil if self.trechos_com_cpu else None
+        if perfil is not None:
+            perfil.dump_stats(f"{base}.prof")
+        with open(f"{base}.txt", "w", encoding="utf-8") as f:
+            if self.trechos_sem_cpu:
+                f.write(f"CPU não perfilada em {self.trechos_sem_cpu} trecho(s): outro cProfile ativo no processo\n")
+            f.write(_relatorio(self.nome, perfil, snapshot, pico, self.duracao))
+        print(f"🔬 Profiling de {self.nome}: {self.duracao:.2f}s -> {base}.{'prof' if perfil else 'txt'}")
+
+
+def perfilar(func, pasta):
+    """Envolve func para gravar um perfil de CPU e de memória a cada chamada"""
+    nome = func.__name__
+
+    if inspect.isgeneratorfunction(func):
+        # Geradores: o trabalho acontece durante a iteração, não na chamada.
+        # O perfil só fica ligado dentro de cada next()
+        @wraps(func)
+        def wrapper_gerador(*args, **kwargs):
+            gerador = func(*args, **kwargs)
+            sessao = None
+            try:
+                while True:
+                    if getattr(_local, "ativo", False):
+                        # Retomado dentro de outra chamada perfilada: entra no perfil dela
+                        item = next(gerador, _FIM)
+                    else:
+                        if sessao is None:
+                            sessao = _Sessao(nome, pasta)
+                        with sessao.medir():
+                            item = next(gerador, _FIM)
+                    if item is _FIM:
+                        return
+                    yield item
+            finally:
+                gerador.close()
+                if sessao is not None:
+                    sessao.finalizar()
+
+        return wrapper_gerador
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # Chamadas aninhadas (ex.: pipeline_completo -> criar_excel) entram no perfil externo
+        if getattr(_local, "ativo", False):
+            return func(*args, **kwargs)
+        sessao = _Sessao(nome, pasta)
+        try:
+            with sessao.medir():
+                return func(*args, **kwargs)
+        finally:
+            sessao.finalizar()
+
+    return wrapper
+
+
+def ativar_profiling(objeto, pasta="profiling"):
+    """
+    Substitui os métodos públicos da instância por versões perfiladas
+
+    Só é chamado quando o profiling está ativo, então sem ele os métodos
+    continuam sendo os originais da classe (custo zero).
+    """
+    for nome, _ in inspect.getmembers(type(objeto), inspect.isfunction):
+        if not nome.startswith("_"):
+            setattr(objeto, nome, perfilar(getattr(objeto, nome), pasta))
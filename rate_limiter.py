@@ -1,26 +1,30 @@
 import time
+import threading
 from functools import wraps
 
 
 def rate_limit(max_per_minute):
-    """Decorator para limitar chamadas à API"""
+    """Decorator para limitar chamadas à API (seguro para uso com threads)"""
     min_interval = 60.0 / max_per_minute
     last_called = [0.0]
+    lock = threading.Lock()
 
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            elapsed = time.time() - last_called[0]
-            left_to_wait = min_interval - elapsed
+            # Reserva o próximo horário livre; threads concorrentes ficam em fila
+            with lock:
+                agora = time.time()
+                inicio = max(agora, last_called[0] + min_interval)
+                last_called[0] = inicio
 
+            left_to_wait = inicio - agora
             if left_to_wait > 0:
                 print(f"⏳ Aguardando {left_to_wait:.1f}s (rate limit)...")
                 time.sleep(left_to_wait)
 
-            ret = func(*args, **kwargs)
-            last_called[0] = time.time()
-            return ret
+            return func(*args, **kwargs)
 
         return wrapper
 
-    return decorator
\ No newline at end of file
+    return decorator
@@ -0,0 +1,99 @@
+import hashlib
+import json
+from resumo_word import perguntar_com_cache, resumir_blocos
+
+PROMPT_BLOCO_DADOS = """Analise o bloco abaixo de uma planilha Excel (parte {parte} de {total}).
+Os dados estão em JSON, com os cabeçalhos e as linhas do bloco.
+
+Liste de forma objetiva:
+- totais, médias e contagens relevantes
+- padrões e tendências
+- valores fora do comum
+
+NÃO use markdown ou formatação especial.
+
+{texto}"""
+
+PROMPT_COMBINAR_DADOS = """Os textos abaixo são análises parciais, em ordem, de blocos de uma mesma planilha Excel.
+Combine-as em uma única análise, somando totais e contagens quando fizer sentido e sem repetições.
+NÃO use markdown ou formatação especial.
+
+{texto}"""
+
+PROMPT_RELATORIO = """Com base na análise abaixo de uma planilha Excel, crie um relatório executivo completo.
+
+{texto}
+
+Crie um relatório com:
+1. RESUMO EXECUTIVO: visão geral dos dados
+2. ANÁLISE DETALHADA: insights principais e padrões identificados
+3. ESTATÍSTICAS: números e métricas importantes
+4. CONCLUSÕES: principais descobertas
+5. RECOMENDAÇÕES: sugestões baseadas nos dados
+
+Escreva de forma profissional, objetiva e estruturada.
+Use parágrafos separados para cada seção.
+NÃO use markdown ou formatação especial."""
+
+
+def _impressao_digital(linha):
+    """Hash estável de uma linha (hash() do Python muda a cada execução)"""
+    texto = json.dumps(linha, ensure_ascii=False, default=str)
+    return int(hashlib.sha1(texto.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def dividir_linhas(linhas, tamanho_bloco=200):
+    """
+    Divide as linhas em blocos com cortes definidos pelo conteúdo
+
+    Um bloco termina após uma linha cujo hash é múltiplo de tamanho_bloco
+    (respeitando um mínimo de tamanho_bloco / 4 e um máximo de 2 * tamanho_bloco
+    linhas). Assim, inserir ou remover linhas muda só o bloco afetado, em vez
+    de deslocar todos os blocos seguintes como aconteceria com cortes fixos.
+
+    Yields:
+        Listas de linhas
+    """
+    minimo = max(tamanho_bloco // 4, 1)
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= 2 * tamanho_bloco or (
+                len(bloco) >= minimo and _impressao_digital(linha) % tamanho_bloco == 0):
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def analisar_incremental(cabecalhos, linhas, perguntar, cache, tamanho_bloco=200, max_workers=4):
+    """
+    Analisa a planilha por blocos reaproveitando as análises de blocos que não mudaram
+
+    Args:
+        cabecalhos: lista com nomes das colunas
+        linhas: iterável de linhas de dados (sem o cabeçalho)
+        perguntar: função que recebe o prompt e retorna a resposta da IA
+        cache: CacheResumos com o estado da última execução
+        tamanho_bloco: número médio de linhas por bloco
+        max_workers: número de chamadas simultâneas à IA
+
+    Returns:
+        (relatório, número de blocos, número de chamadas feitas à IA)
+    """
+    blocos = [
+        json.dumps({"cabecalhos": cabecalhos, "linhas": bloco}, ensure_ascii=False, default=str)
+        for bloco in dividir_linhas(linhas, tamanho_bloco)
+    ]
+    if not blocos:
+        blocos = [json.dumps({"cabecalhos": cabecalhos, "linhas": []}, ensure_ascii=False)]
+
+    analise, chamadas = resumir_blocos(
+        blocos, perguntar, cache, max_workers=max_workers,
+        prompt_bloco=PROMPT_BLOCO_DADOS, prompt_combinar=PROMPT_COMBINAR_DADOS
+    )
+
+    relatorio, chamou = perguntar_com_cache(
+        perguntar, cache, PROMPT_RELATORIO, PROMPT_RELATORIO.format(texto=analise), analise
+    )
+    return relatorio, len(blocos), chamadas + int(chamou)
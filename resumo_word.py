@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Estimativa grosseira usada para limitar o tamanho dos blocos
+CARACTERES_POR_TOKEN = 4
+
+# Versão do formato do cache (os prompts já fazem parte da chave)
+VERSAO_CACHE = "1"
+
+PROMPT_BLOCO = """Resuma o trecho abaixo de um documento longo (parte {parte} de {total}).
+Mantenha fatos, números, nomes e conclusões importantes.
+Escreva em parágrafos, sem markdown.
+
+{texto}"""
+
+PROMPT_COMBINAR = """Os textos abaixo são resumos parciais, em ordem, de um mesmo documento.
+Combine-os em um único resumo coeso, sem repetições, mantendo os pontos principais.
+Escreva em parágrafos, sem markdown.
+
+{texto}"""
+
+
+def estimar_tokens(texto):
+    """Estimativa do número de tokens de um texto"""
+    return len(texto) // CARACTERES_POR_TOKEN + 1
+
+
+def _fatiar(texto, max_tokens):
+    """Quebra um parágrafo grande demais em pedaços de até max_tokens"""
+    tamanho = max_tokens * CARACTERES_POR_TOKEN
+    return [texto[i:i + tamanho] for i in range(0, len(texto), tamanho)]
+
+
+def _secoes(paragrafos):
+    """Agrupa (nivel, texto) em seções que começam a cada título"""
+    secao = []
+    for nivel, texto in paragrafos:
+        if nivel is not None and secao:
+            yield secao
+            secao = []
+        secao.append(texto)
+    if secao:
+        yield secao
+
+
+def dividir_em_blocos(paragrafos, max_tokens=6000):
+    """
+    Divide o documento em blocos de até max_tokens respeitando os títulos
+
+    Um bloco é fechado em um título quando já passou da metade do limite ou
+    quando a próxima seção não cabe. Como a decisão depende só do conteúdo
+    desde o último corte, editar uma seção muda apenas o bloco dela (e no
+    máximo o seguinte), e os demais continuam aproveitando o cache.
+
+    Args:
+        paragrafos: lista de (nivel, texto), como ler_word(com_titulos=True)
+        max_tokens: tamanho máximo estimado de cada bloco
+
+    Returns:
+        Lista de blocos (str)
+    """
+    blocos = []
+    atual = []
+    tokens_atual = 0
+
+    def fechar():
+        nonlocal atual, tokens_atual
+        if atual:
+            blocos.append("\n".join(atual))
+        atual = []
+        tokens_atual = 0
+
+    for secao in _secoes(paragrafos):
+        tokens_secao = sum(estimar_tokens(p) for p in secao)
+        if tokens_atual and (tokens_atual + tokens_secao > max_tokens or tokens_atual >= max_tokens // 2):
+            fechar()
+
+        for paragrafo in secao:
+            for pedaco in _fatiar(paragrafo, max_tokens):
+                tokens = estimar_tokens(pedaco)
+                if tokens_atual and tokens_atual + tokens > max_tokens:
+                    fechar()
+                atual.append(pedaco)
+                tokens_atual += tokens
+
+    fechar()
+    return blocos
+
+
+class CacheResumos:
+    """Cache em JSON dos resumos já feitos, indexado pelo hash do texto"""
+
+    def __init__(self, arquivo, modelo=""):
+        self.arquivo = arquivo
+        self.modelo = modelo
+        self._lock = threading.Lock()
+        self._dados = {}
+        if arquivo and os.path.exists(arquivo):
+            with open(arquivo, encoding="utf-8") as f:
+                self._dados = json.load(f)
+        self._usadas = set()
+
+    def chave(self, tipo, texto):
+        """Hash do texto junto com o modelo de IA e o tipo (ex.: o modelo do prompt)"""
+        conteudo = f"{VERSAO_CACHE}|{self.modelo}|{tipo}|{texto}"
+        return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+    def obter(self, chave):
+        with self._lock:
+            self._usadas.add(chave)
+            return self._dados.get(chave)
+
+    def guardar(self, chave, resumo):
+        with self._lock:
+            self._usadas.add(chave)
+            self._dados[chave] = resumo
+
+    def salvar(self):
+        """Grava o cache mantendo apenas as entradas usadas nesta execução"""
+        if not self.arquivo:
+            return
+        with self._lock:
+            dados = {k: v for k, v in self._dados.items() if k in self._usadas}
+        with open(self.arquivo, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False)
+
+
+def resumir_blocos(blocos, perguntar, cache, max_tokens=6000, max_workers=4,
+                   prompt_bloco=PROMPT_BLOCO, prompt_combinar=PROMPT_COMBINAR):
+    """
+    Map-reduce: resume os blocos em paralelo e combina os resumos em níveis
+
+    Args:
+        blocos: lista de textos
+        perguntar: função que recebe o prompt e retorna a resposta da IA
+        cache: CacheResumos
+        max_tokens: tamanho máximo estimado de cada chamada de combinação
+        max_workers: número de chamadas simultâneas (o rate limit continua valendo)
+        prompt_bloco: modelo do prompt de cada bloco ({parte}, {total}, {texto})
+        prompt_combinar: modelo do prompt de combinação ({texto})
+
+    Returns:
+        (resumo final, número de chamadas feitas à IA)
+    """
+    chamadas = [0]
+    lock = threading.Lock()
+
+    def resumir(modelo_prompt, prompt, texto):
+        resumo, chamou = perguntar_com_cache(perguntar, cache, modelo_prompt, prompt, texto)
+        if chamou:
+            with lock:
+                chamadas[0] += 1
+        return resumo
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        total = len(blocos)
+        resumos = list(executor.map(
+            lambda item: resumir(prompt_bloco, prompt_bloco.format(parte=item[0], total=total, texto=item[1]), item[1]),
+            enumerate(blocos, 1)
+        ))
+
+        # Reduce hierárquico: agrupa resumos vizinhos até sobrar um só
+        while len(resumos) > 1:
+            grupos = dividir_em_blocos([(None, r) for r in resumos], max_tokens)
+            if len(grupos) >= len(resumos):
+                # Cada resumo já ocupa um bloco inteiro: combina de dois em dois
+                grupos = ["\n\n".join(resumos[i:i + 2]) for i in range(0, len(resumos), 2)]
+            resumos = list(executor.map(
+                lambda texto: resumir(prompt_combinar, prompt_combinar.format(texto=texto), texto),
+                grupos
+            ))
+
+    return (resumos[0] if resumos else ""), chamadas[0]
+
+
+def perguntar_com_cache(perguntar, cache, modelo_prompt, prompt, texto):
+    """
+    Pergunta à IA só se o par (modelo do prompt, texto) ainda não estiver no cache
+
+    Returns:
+        (resposta, True se a IA foi chamada)
+    """
+    chave = cache.chave(modelo_prompt, texto)
+    resposta = cache.obter(chave)
+    if resposta is not None:
+        return resposta, False
+
+    resposta = perguntar(prompt).strip()
+    if not resumo_valido(resposta):
+        raise RuntimeError(resposta)
+    cache.guardar(chave, resposta)
+    return resposta, True
+
+
+def resumo_valido(resposta):
+    """perguntar_ia devolve as falhas como texto; essas respostas não vão para o cache"""
+    return bool(resposta) and not resposta.startswith(("Erro:", "❌ Erro"))
@@ -0,0 +1,313 @@
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+# Representação compacta das linhas lidas de uma planilha (ler_excel com
+# compacto=True).
+#
+# Uma lista de listas guarda um objeto Python por célula (ponteiro de 8 bytes
+# mais 24-60 bytes do int/float/str). Aqui cada coluna guarda seus valores em
+# um buffer do módulo array: inteiros, decimais e datas ocupam 8 bytes por
+# célula e textos viram códigos em um dicionário (1, 2 ou 4 bytes por célula,
+# cada texto distinto guardado uma vez). Colunas com tipos misturados caem
+# para uma lista comum. A tabela continua se comportando como a lista de
+# listas: len, iteração, índice e fatias devolvem as mesmas linhas.
+
+EPOCA = datetime(1970, 1, 1)
+UM_MICROSSEGUNDO = timedelta(microseconds=1)
+
+# Maior inteiro representado sem perda em um float (colunas int + float)
+_MAX_INTEIRO_FLOAT = 2 ** 53
+
+# Tamanho do código do dicionário de textos conforme o número de textos distintos
+_CODIGOS = (("B", 2 ** 8), ("H", 2 ** 16), ("I", 2 ** 32))
+
+# Linhas convertidas por vez na iteração
+TAMANHO_LOTE = 4096
+
+
+class _Coluna:
+    """Valores de uma coluna em um buffer tipado, com nulos marcados à parte"""
+
+    __slots__ = ("tipo", "tamanho", "valores", "nulos", "inteiros", "textos", "indices")
+
+    def __init__(self, tamanho=0):
+        # tipo: "vazio" (só None até agora), "int", "float", "data", "texto" ou "objeto"
+        self.tipo = "vazio"
+        self.tamanho = tamanho
+        self.valores = None    # array (int/float/data), códigos (texto) ou list (objeto)
+        self.nulos = None      # bytearray, criado no primeiro None
+        self.inteiros = None   # bytearray: em colunas float, linhas que eram int
+        self.textos = None     # lista de textos distintos (texto)
+        self.indices = None    # texto -> código (texto)
+
+    # ============ ESCRITA ============
+
+    def anexar(self, valor):
+        tipo = self.tipo
+        if valor is None:
+            if tipo == "objeto":
+                self.valores.append(None)
+            elif tipo != "vazio":
+                if self.nulos is None:
+                    self.nulos = bytearray(self.tamanho)
+                self.nulos.append(1)
+                self.valores.append(0)
+                if self.inteiros is not None:
+                    self.inteiros.append(0)
+            self.tamanho += 1
+            return
+
+        classe = type(valor)
+        if tipo == "vazio":
+            tipo = self._iniciar(classe)
+        if tipo != "objeto" and not self._anexar_tipado(tipo, classe, valor):
+            self._para_objeto()
+            tipo = "objeto"
+        if tipo == "objeto":
+            self.valores.append(valor)
+        elif self.nulos is not None:
+            self.nulos.append(0)
+        self.tamanho += 1
+
+    def _iniciar(self, classe):
+        """Escolhe o tipo da coluna pelo primeiro valor não nulo"""
+        nulos = self.tamanho
+        if classe is int:
+            self.tipo, self.valores = "int", array("q", bytes(8 * nulos))
+        elif classe is float:
+            self.tipo, self.valores = "float", array("d", bytes(8 * nulos))
+        elif classe is datetime:
+            self.tipo, self.valores = "data", array("q", bytes(8 * nulos))
+        elif classe is str:
+            self.tipo, self.valores = "texto", array("B", bytes(nulos))
+            self.textos, self.indices = [], {}
+        else:
+            self.tipo, self.valores = "objeto", [None] * nulos
+        if nulos and self.tipo != "objeto":
+            self.nulos = bytearray(b"\x01" * nulos)
+        return self.tipo
+
+    def _anexar_tipado(self, tipo, classe, valor):
+        """Anexa no buffer; False se o valor não cabe no tipo da coluna"""
+        if tipo == "texto":
+            if classe is not str:
+                return False
+            codigo = self.indices.get(valor)
+            if codigo is None:
+                codigo = len(self.textos)
+                self.indices[valor] = codigo
+                self.textos.append(valor)
+                for formato, limite in _CODIGOS:
+                    if codigo < limite:
+                        if formato != self.valores.typecode:
+                            self.valores = array(formato, self.valores)
+                        break
+            self.valores.append(codigo)
+        elif tipo == "int":
+            if classe is float:
+                if not self._int_para_float():
+                    return False
+                return self._anexar_tipado("float", classe, valor)
+            if classe is not int:
+                return False
+            try:
+                self.valores.append(valor)
+            except OverflowError:
+                return False
+        elif tipo == "float":
+            if classe is int:
+                if abs(valor) > _MAX_INTEIRO_FLOAT:
+                    return False
+                if self.inteiros is None:
+                    self.inteiros = bytearray(self.tamanho)
+                self.valores.append(valor)
+                self.inteiros.append(1)
+                return True
+            if classe is not float:
+                return False
+            self.valores.append(valor)
+            if self.inteiros is not None:
+                self.inteiros.append(0)
+        elif tipo == "data":
+            if classe is not datetime or valor.tzinfo is not None:
+                return False
+            self.valores.append((valor - EPOCA) // UM_MICROSSEGUNDO)
+        return True
+
+    def _int_para_float(self):
+        """Coluna de inteiros recebeu um decimal: passa a float lembrando quais eram int"""
+        if self.valores and (max(self.valores) > _MAX_INTEIRO_FLOAT or min(self.valores) < -_MAX_INTEIRO_FLOAT):
+            return False
+        self.tipo = "float"
+        self.valores = array("d", self.valores)
+        self.inteiros = bytearray(b"\x01" * self.tamanho)
+        return True
+
+    def _para_objeto(self):
+        """Tipos misturados: a coluna vira uma lista comum"""
+        self.valores = self.fatia(0, self.tamanho)
+        self.tipo = "objeto"
+        self.nulos = self.inteiros = self.textos = self.indices = None
+
+    # ============ LEITURA ============
+
+    def fatia(self, inicio, fim):
+        """Valores Python das linhas inicio:fim"""
+        tipo = self.tipo
+        if tipo == "vazio":
+            return [None] * (fim - inicio)
+        if tipo == "objeto":
+            return self.valores[inicio:fim]
+
+        brutos = self.valores[inicio:fim]
+        if tipo == "texto":
+            textos = self.textos
+            valores = [textos[codigo] for codigo in brutos]
+        elif tipo == "data":
+            valores = [EPOCA + timedelta(microseconds=v) for v in brutos]
+        elif self.inteiros is not None:
+            valores = [int(v) if inteiro else v for v, inteiro in zip(brutos, self.inteiros[inicio:fim])]
+        else:
+            valores = brutos.tolist()
+
+        if self.nulos is not None:
+            nulos = self.nulos[inicio:fim]
+            j = nulos.find(1)
+            while j >= 0:
+                valores[j] = None
+                j = nulos.find(1, j + 1)
+        return valores
+
+    def valor(self, i):
+        return self.fatia(i, i + 1)[0]
+
+    def numpy(self):
+        """Array NumPy da coluna (sem cópia para colunas int sem nulos)"""
+        import numpy as np
+
+        tipo = self.tipo
+        if tipo in ("int", "float", "data") and self.inteiros is None:
+            if tipo == "int" and self.nulos is not None:
+                return _objetos(self.fatia(0, self.tamanho))
+            coluna = np.frombuffer(self.valores, dtype=np.int64 if tipo != "float" else np.float64)
+            if tipo == "data":
+                coluna = coluna.astype("datetime64[us]")
+            if self.nulos is not None:
+                if tipo == "float":
+                    coluna = coluna.copy()
+                coluna[np.frombuffer(self.nulos, dtype=np.bool_)] = np.nan if tipo == "float" else np.datetime64("NaT")
+            return coluna
+        if tipo == "texto":
+            textos = np.empty(len(self.textos) + 1, dtype=object)
+            textos[:-1] = self.textos
+            codigos = np.frombuffer(self.valores, dtype=self.valores.typecode).astype(np.intp)
+            if self.nulos is not None:
+                codigos[np.frombuffer(self.nulos, dtype=np.bool_)] = len(self.textos)
+            return textos[codigos]
+        return _objetos(self.fatia(0, self.tamanho))
+
+
+def _objetos(valores):
+    import numpy as np
+
+    # np.array(lista) tentaria criar dimensões a partir de valores sequência
+    coluna = np.empty(len(valores), dtype=object)
+    coluna[:] = valores
+    return coluna
+
+
+class TabelaColunar(Sequence):
+    """
+    Linhas de uma planilha guardadas por coluna em buffers compactos
+
+    Se comporta como a lista de listas de ler_excel: len(), iteração,
+    tabela[i] (lista) e tabela[a:b] (lista de listas). A primeira linha
+    (normalmente os cabeçalhos) fica à parte, para não misturar textos nas
+    colunas numéricas. Linhas mais curtas são completadas com None.
+    """
+
+    def __init__(self):
+        self.primeira_linha = None
+        self.colunas = []
+        self._linhas = 0
+
+    @classmethod
+    def de_linhas(cls, linhas):
+        """Monta a tabela consumindo um iterável de linhas (sem guardar as listas)"""
+        tabela = cls()
+        for linha in linhas:
+            tabela.anexar(linha)
+        return tabela
+
+    def anexar(self, linha):
+        if self.primeira_linha is None:
+            self.primeira_linha = list(linha)
+            self.completar_colunas(len(linha))
+            return
+
+        self.completar_colunas(len(linha))
+        colunas = self.colunas
+        for j, valor in enumerate(linha):
+            colunas[j].anexar(valor)
+        for coluna in colunas[len(linha):]:
+            coluna.anexar(None)
+        self._linhas += 1
+
+    def completar_colunas(self, num_colunas):
+        """Garante pelo menos num_colunas colunas (as novas começam com None)"""
+        while len(self.colunas) < num_colunas:
+            self.colunas.append(_Coluna(self._linhas))
+        if self.primeira_linha is not None and len(self.primeira_linha) < num_colunas:
+            self.primeira_linha.extend([None] * (num_colunas - len(self.primeira_linha)))
+
+    @property
+    def num_colunas(self):
+        return len(self.colunas)
+
+    def __len__(self):
+        return self._linhas + (self.primeira_linha is not None)
+
+    def _linhas_dados(self, inicio, fim):
+        """Gera as linhas de dados inicio:fim (índices sem a primeira linha)"""
+        for lote in range(inicio, fim, TAMANHO_LOTE):
+            limite = min(lote + TAMANHO_LOTE, fim)
+            colunas = [coluna.fatia(lote, limite) for coluna in self.colunas]
+            yield from map(list, zip(*colunas)) if colunas else ([] for _ in range(limite - lote))
+
+    def __iter__(self):
+        if self.primeira_linha is None:
+            return
+        yield list(self.primeira_linha)
+        yield from self._linhas_dados(0, self._linhas)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fim, passo = indice.indices(len(self))
+            if passo != 1:
+                return [self[i] for i in range(inicio, fim, passo)]
+            if fim <= inicio:
+                return []
+            linhas = [list(self.primeira_linha)] if inicio == 0 else []
+            linhas.extend(self._linhas_dados(max(inicio - 1, 0), fim - 1))
+            return linhas
+
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice fora da tabela")
+        if indice == 0:
+            return list(self.primeira_linha)
+        return [coluna.valor(indice - 1) for coluna in self.colunas]
+
+    def __eq__(self, outra):
+        if isinstance(outra, (TabelaColunar, list)):
+            return len(self) == len(outra) and all(a == b for a, b in zip(self, outra))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"<TabelaColunar {len(self)} linhas x {self.num_colunas} colunas>"
+
+    def colunas_numpy(self):
+        """Colunas das linhas de dados (sem a primeira linha) como arrays NumPy"""
+        return [coluna.numpy() for coluna in self.colunas]
@@ -0,0 +1,119 @@
+import re
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+# Caracteres de controle que não são permitidos em XML 1.0
+_CONTROLE_INVALIDO = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Largura padrão (em twips) usada quando o documento não tem seção
+_LARGURA_PADRAO = 9026
+
+
+def texto_xml(valor):
+    """Converte o valor de uma célula para texto seguro em XML"""
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        texto = valor.strftime('%d/%m/%Y %H:%M') if (valor.hour or valor.minute) else valor.strftime('%d/%m/%Y')
+    elif isinstance(valor, date):
+        texto = valor.strftime('%d/%m/%Y')
+    else:
+        texto = str(valor)
+    return escape(_CONTROLE_INVALIDO.sub("", texto))
+
+
+def _largura_util(doc):
+    """Largura útil da página (em twips) da última seção do documento"""
+    try:
+        secao = doc.sections[-1]
+        largura = secao.page_width - secao.left_margin - secao.right_margin
+        return int(largura / 635)  # EMU -> twips
+    except (IndexError, TypeError):
+        return _LARGURA_PADRAO
+
+
+def _id_estilo(doc, estilo):
+    """Resolve o id interno do estilo de tabela (ex.: 'Table Grid' -> 'TableGrid')"""
+    if not estilo:
+        return None
+    try:
+        return doc.styles[estilo].style_id
+    except KeyError:
+        return None
+
+
+def inserir_tabela(doc, linhas, cabecalhos=None, estilo="Table Grid"):
+    """
+    Insere uma tabela no final de um Document gerando o XML em uma única passada
+
+    A API célula a célula do python-docx (add_table + table.cell) recalcula
+    a grade a cada acesso e fica quadrática com o número de linhas. Aqui o
+    XML da tabela é montado como texto, com as propriedades de célula e de
+    cabeçalho compartilhadas, e convertido em elemento uma única vez.
+
+    Args:
+        doc: documento python-docx (Document)
+        linhas: iterável de linhas (listas/tuplas), ex.: saída de ler_excel ou iter_excel
+        cabecalhos: lista com nomes das colunas (opcional, linha em negrito repetida por página)
+        estilo: nome do estilo de tabela do documento (padrão: "Table Grid")
+
+    Returns:
+        A tabela inserida (docx.table.Table) ou None se não houver colunas
+    """
+    linhas = iter(linhas)
+    primeira = list(cabecalhos) if cabecalhos else next(linhas, None)
+    if not primeira:
+        return None
+    num_colunas = len(primeira)
+
+    largura_coluna = _largura_util(doc) // num_colunas
+
+    # Trechos de XML compartilhados por todas as células
+    celula_abre = f'<w:tc><w:tcPr><w:tcW w:w="{largura_coluna}" w:type="dxa"/></w:tcPr><w:p>'
+    celula_fecha = '</w:p></w:tc>'
+    celula_vazia = f'{celula_abre}{celula_fecha}'
+    run_normal = '<w:r><w:t xml:space="preserve">{}</w:t></w:r>'
+    run_negrito = '<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">{}</w:t></w:r>'
+
+    def linha_xml(valores, run, propriedades=""):
+        partes = ['<w:tr>', propriedades]
+        for i, valor in enumerate(valores):
+            if i >= num_colunas:
+                break
+            texto = texto_xml(valor)
+            if texto:
+                partes.append(celula_abre + run.format(texto) + celula_fecha)
+            else:
+                partes.append(celula_vazia)
+        # Completa linhas curtas para manter a grade retangular
+        for _ in range(len(valores), num_colunas):
+            partes.append(celula_vazia)
+        partes.append('</w:tr>')
+        return "".join(partes)
+
+    id_estilo = _id_estilo(doc, estilo)
+    xml = [
+        f'<w:tbl {nsdecls("w")}><w:tblPr>',
+        f'<w:tblStyle w:val="{id_estilo}"/>' if id_estilo else '',
+        '<w:tblW w:w="0" w:type="auto"/><w:tblLook w:val="04A0" w:firstRow="1" w:lastRow="0"'
+        ' w:firstColumn="1" w:lastColumn="0" w:noHBand="0" w:noVBand="1"/></w:tblPr><w:tblGrid>',
+        f'<w:gridCol w:w="{largura_coluna}"/>' * num_colunas,
+        '</w:tblGrid>',
+    ]
+
+    if cabecalhos:
+        xml.append(linha_xml(primeira, run_negrito, '<w:trPr><w:tblHeader/></w:trPr>'))
+    else:
+        xml.append(linha_xml(primeira, run_normal))
+
+    for linha in linhas:
+        xml.append(linha_xml(linha, run_normal))
+
+    xml.append('</w:tbl>')
+
+    tbl = parse_xml("".join(xml))
+    doc.element.body._insert_tbl(tbl)
+    return doc.tables[-1]